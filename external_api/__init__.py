@@ -1,14 +1,37 @@
 import os
+import threading
+from typing import Any, List, Optional
 
-from external_api.data_sources import *
-from external_api.function_utils import MCP_FUNCTION_LIST_JSON_FILE, ToolResult, load_function_proxys
+from external_api.function_utils import MCP_FUNCTION_LIST_JSON_FILE, FunctionProxies, ToolEvent, ToolResult, load_function_proxys
 
-proxies = {}
-_, proxies = load_function_proxys(os.path.join(os.path.dirname(__file__), MCP_FUNCTION_LIST_JSON_FILE))
-globals().update(proxies)
+# 函数列表在首次访问 proxies、__all__ 或函数名时加载
+_proxies: Optional[FunctionProxies] = None
+_proxies_lock = threading.Lock()
+
+
+def _get_proxies() -> FunctionProxies:
+    global _proxies
+    if _proxies is None:
+        with _proxies_lock:
+            if _proxies is None:  # Double-check
+                _, _proxies = load_function_proxys(os.path.join(os.path.dirname(__file__), MCP_FUNCTION_LIST_JSON_FILE))
+    return _proxies
+
+
+def __getattr__(name: str) -> Any:
+    if name == "proxies":
+        return _get_proxies()
+    if name == "__all__":
+        return ["ToolResult", "ToolEvent"] + list(_get_proxies())
+    if not name.startswith("_") and name in _get_proxies():
+        return _get_proxies()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | {"proxies"} | set(_get_proxies()))
 
-__all__ = ["ToolResult"] + list(proxies.keys())
 
 if __name__ == "__main__":
-    print(__all__)
+    print(__getattr__("__all__"))
     print(globals())
@@ -0,0 +1,431 @@
+"""
+external_api 导入耗时与冷启动基准测试
+
+测量内容:
+    - 各模块的导入耗时(基于 python -X importtime, 每次在新进程中测量)
+    - ApiClient 单例的创建耗时
+    - 每个数据源首次访问(导入模块并创建实例)、首次调用与再次调用的耗时, 调用对象为本地桩服务
+
+每项测量重复多次取中位数, 结果追加到当前目录下的 benchmark_results.jsonl(可用 --output 指定), 并与同一文件中
+主机、平台、Python 版本与传输层都相同的上一次记录对比, 便于发现不同提交之间的性能退化。
+
+用法:
+    python -m external_api.benchmark [--repeat 5] [--output PATH] [--no-save]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_REPEAT = 5
+# 测量结果默认追加到的文件, 相对于当前工作目录
+DEFAULT_RESULTS_PATH = Path("benchmark_results.jsonl")
+
+# 单独统计导入耗时的第三方包
+TRACKED_PACKAGES = ("aiohttp", "httpx", "pydantic", "docstring_parser", "numpy")
+
+# 测量导入耗时的入口模块
+IMPORT_TARGETS = ("external_api", "external_api.data_sources.client")
+
+# 与上一次记录相比变慢超过该比例且超过最小差值时标记为退化, 避免亚毫秒级指标的抖动被误报
+REGRESSION_THRESHOLD = 0.2
+REGRESSION_MIN_DELTA_MS = 1.0
+
+# 每个数据源首次调用的方法与参数
+FIRST_CALLS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    "yahoo_finance": ("get_stock_price", {"symbol": "AAPL", "start_date": "2024-01-01", "end_date": "2024-01-08"}),
+    "twitter": ("search_tweets", {"query": "python"}),
+    "booking": ("search_hotels_by_dest_name", {"dest_name": "shanghai", "arrival_date": "2025-04-19", "departure_date": "2025-04-26"}),
+    "tripadvisor": ("search_locations", {"searchQuery": "eiffel tower"}),
+    "commodities": ("get_supported_commodities", {}),
+    "metal": ("get_metal_price", {"currency_code": "USD"}),
+    "patent": ("search_patents", {"query": "battery"}),
+    "scholar": ("search_scholar", {"query": "transformer"}),
+    "pinterest": ("search_pins", {"keyword": "garden"}),
+}
+
+# 桩服务按请求路径后缀返回的最小有效响应
+STUB_RESPONSES: Dict[str, Any] = {
+    "/stock/v3/get-chart": {
+        "chart": {
+            "result": [
+                {
+                    "timestamp": [1704119400 + day * 86400 for day in range(5)],
+                    "indicators": {
+                        "quote": [{"open": [1.0] * 5, "high": [1.0] * 5, "low": [1.0] * 5, "close": [1.0] * 5, "volume": [1] * 5}]
+                    },
+                }
+            ],
+            "error": None,
+        }
+    },
+    "/search/search": {"results": [], "continuation_token": None},
+    "/api/v1/hotels/searchDestination": {
+        "status": True,
+        "data": [
+            {
+                "dest_id": "-1",
+                "search_type": "city",
+                "name": "Shanghai",
+                "city_name": "Shanghai",
+                "label": "Shanghai, China",
+                "longitude": 121.47,
+                "latitude": 31.23,
+                "country": "China",
+            }
+        ],
+    },
+    "/api/v1/hotels/searchHotels": {"status": True, "data": {"hotels": []}},
+    "/api/v1/location/search": {"data": [{"location_id": "1", "name": "Eiffel Tower"}]},
+    "/v1/supported": {"success": True, "supported_commodities": [], "supported_currencies": []},
+    "/web-crawling/api/gold-index": {"data": {}},
+    "/patents": {"organic": []},
+    "/scholar": {"organic": []},
+    "/pinterest/pins/advance": {"data": [], "nextPageCursor": None},
+}
+
+
+class StubServer:
+    """
+    本地桩服务, 在后台线程的事件循环中运行, 按路径后缀返回 STUB_RESPONSES 中的响应
+    """
+
+    def __init__(self):
+        self.port = _free_port()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def _handle(self, request):
+        from aiohttp import web
+
+        for suffix, payload in STUB_RESPONSES.items():
+            if request.path.endswith(suffix):
+                return web.json_response(payload)
+        return web.json_response({"error": f"no stub for {request.path}"}, status=404)
+
+    async def _start(self):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._start())
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _child_env(extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    env = dict(os.environ)
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    env.update(extra or {})
+    return env
+
+
+def measure_imports(module: str) -> Dict[str, Any]:
+    """
+    在新进程中导入模块并解析 -X importtime 输出
+
+    Returns:
+        Dict[str, Any]: 包含 ok, total_ms(入口模块累计耗时), packages_ms(各跟踪包的累计耗时),
+            modules_ms(external_api 下各模块的自身耗时), error
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, env=_child_env()
+    )
+    cumulative: Dict[str, float] = {}
+    self_times: Dict[str, float] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        name = name.strip()
+        # 同一模块只记录第一次(真正执行导入的那一次)
+        cumulative.setdefault(name, int(cumulative_us) / 1000)
+        self_times.setdefault(name, int(self_us) / 1000)
+
+    result: Dict[str, Any] = {
+        "ok": process.returncode == 0,
+        "total_ms": cumulative.get(module),
+        "packages_ms": {package: cumulative[package] for package in TRACKED_PACKAGES if package in cumulative},
+        "modules_ms": {name: self_times[name] for name in self_times if name.startswith("external_api")},
+    }
+    if process.returncode != 0:
+        result["error"] = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else f"exit code {process.returncode}"
+    return result
+
+
+def run_cold_start(stub_url: str) -> Dict[str, Any]:
+    """
+    在新进程中测量单例创建与各数据源的首次访问、首次调用和再次调用耗时
+    """
+    # 目的地缓存指向本次运行的临时文件: 桩服务的结果不会写入用户的缓存, 每次运行都从空缓存开始, 首次调用耗时可比
+    with tempfile.TemporaryDirectory(prefix="external_api_benchmark_") as cache_dir:
+        env = _child_env(
+            {"LLM_GATEWAY_BASE_URL": stub_url, "BOOKING_DESTINATION_CACHE": os.path.join(cache_dir, "booking_destinations.json")}
+        )
+        # 以脚本方式运行, 避免子进程在开始计时前已经导入 external_api
+        process = subprocess.run([sys.executable, str(Path(__file__).resolve()), "--child"], capture_output=True, text=True, env=env)
+    if process.returncode != 0:
+        raise RuntimeError(f"Cold start run failed: {process.stderr.strip()}")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def _child_main() -> None:
+    """冷启动测量子进程, 结果以一行 JSON 输出到 stdout"""
+    start = time.perf_counter()
+    from external_api.data_sources.client import get_client
+
+    import_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    client = get_client()
+    construct_ms = (time.perf_counter() - start) * 1000
+
+    async def measure() -> Dict[str, Any]:
+        sources = {}
+        for source_name, (method_name, kwargs) in FIRST_CALLS.items():
+            start = time.perf_counter()
+            source = getattr(client, source_name)
+            access_ms = (time.perf_counter() - start) * 1000
+            method = getattr(source, method_name)
+
+            start = time.perf_counter()
+            first = await method(**kwargs)
+            first_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            await method(**kwargs)
+            second_ms = (time.perf_counter() - start) * 1000
+
+            sources[source_name] = {
+                "access_ms": access_ms,
+                "first_call_ms": first_ms,
+                "second_call_ms": second_ms,
+                "success": bool(first.get("success")),
+            }
+        await client.close()
+        return sources
+
+    sources = asyncio.run(measure())
+    print(json.dumps({"client_import_ms": import_ms, "client_construct_ms": construct_ms, "sources": sources}))
+
+
+def _median(values: List[Optional[float]]) -> Optional[float]:
+    present = [value for value in values if value is not None]
+    return round(statistics.median(present), 3) if present else None
+
+
+def _median_dicts(runs: List[Dict[str, float]]) -> Dict[str, Optional[float]]:
+    keys = sorted({key for run in runs for key in run})
+    return {key: _median([run.get(key) for run in runs]) for key in keys}
+
+
+def run_benchmark(repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """
+    执行全部测量, 各项取 repeat 次的中位数
+
+    Returns:
+        Dict[str, Any]: 测量结果记录
+    """
+    imports = {}
+    for target in IMPORT_TARGETS:
+        runs = [measure_imports(target) for _ in range(repeat)]
+        imports[target] = {
+            "ok": all(run["ok"] for run in runs),
+            "total_ms": _median([run["total_ms"] for run in runs]),
+            "packages_ms": _median_dicts([run["packages_ms"] for run in runs]),
+            "modules_ms": _median_dicts([run["modules_ms"] for run in runs]),
+        }
+        errors = [run["error"] for run in runs if "error" in run]
+        if errors:
+            imports[target]["error"] = errors[0]
+
+    stub = StubServer()
+    stub.start()
+    try:
+        runs = [run_cold_start(stub.base_url) for _ in range(repeat)]
+    finally:
+        stub.stop()
+
+    sources = {}
+    for source_name in FIRST_CALLS:
+        source_runs = [run["sources"][source_name] for run in runs if source_name in run["sources"]]
+        sources[source_name] = {
+            key: _median([source_run[key] for source_run in source_runs]) for key in ("access_ms", "first_call_ms", "second_call_ms")
+        }
+        sources[source_name]["success"] = all(source_run["success"] for source_run in source_runs)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "host": platform.node(),
+        "platform": f"{platform.system()} {platform.machine()}",
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "transport": os.getenv("EXTERNAL_API_TRANSPORT") or "aiohttp",
+        "repeat": repeat,
+        "imports": imports,
+        "client_import_ms": _median([run["client_import_ms"] for run in runs]),
+        "client_construct_ms": _median([run["client_construct_ms"] for run in runs]),
+        "sources": sources,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        process = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=Path(__file__).parent, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return process.stdout.strip() or None
+
+
+def load_results(path: Path = DEFAULT_RESULTS_PATH) -> List[Dict[str, Any]]:
+    """读取已保存的全部测量记录, 按保存顺序"""
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_result(result: Dict[str, Any], path: Path = DEFAULT_RESULTS_PATH) -> None:
+    """追加一条测量记录"""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result, ensure_ascii=False, sort_keys=True) + "\n")
+
+
+def _fingerprint(result: Dict[str, Any]) -> Tuple[Any, ...]:
+    """测量环境标识, 只有标识相同的记录之间才有可比性"""
+    return tuple(result.get(key) for key in ("host", "platform", "python", "transport"))
+
+
+def find_previous(result: Dict[str, Any], history: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    在历史记录中查找与 result 测量环境相同的最近一条记录
+
+    Returns:
+        Optional[Dict[str, Any]]: 最近一条可比记录, 不存在时为 None
+    """
+    fingerprint = _fingerprint(result)
+    for record in reversed(history):
+        if _fingerprint(record) == fingerprint:
+            return record
+    return None
+
+
+def _headline_metrics(result: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    metrics = {f"import {target}": info.get("total_ms") for target, info in result.get("imports", {}).items()}
+    metrics["client import"] = result.get("client_import_ms")
+    metrics["client construct"] = result.get("client_construct_ms")
+    for source_name, info in result.get("sources", {}).items():
+        metrics[f"{source_name} access"] = info.get("access_ms")
+        metrics[f"{source_name} first call"] = info.get("first_call_ms")
+    return metrics
+
+
+def format_report(result: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> str:
+    """
+    生成可读的测量报告, 提供 previous 时附带与上一次记录的对比
+    """
+    current_metrics = _headline_metrics(result)
+    previous_metrics = _headline_metrics(previous) if previous else {}
+    header = (
+        f"commit {result.get('commit')}  host {result.get('host')} ({result.get('platform')})  "
+        f"python {result.get('python')}  transport {result.get('transport')}  repeat {result.get('repeat')}"
+    )
+    if previous:
+        header += f"\ncompared with commit {previous.get('commit')} ({previous.get('timestamp')})"
+    else:
+        header += "\nno earlier record from the same host, platform, python and transport to compare with"
+    lines = [header, ""]
+    for name, value in current_metrics.items():
+        line = f"{name:<40} {_format_ms(value):>10}"
+        old_value = previous_metrics.get(name)
+        if value is not None and old_value:
+            change = (value - old_value) / old_value
+            line += f"  {_format_ms(old_value):>10}  {change:+.0%}"
+            if change > REGRESSION_THRESHOLD and value - old_value > REGRESSION_MIN_DELTA_MS:
+                line += "  REGRESSION"
+        lines.append(line)
+
+    for target, info in result.get("imports", {}).items():
+        lines.extend(["", f"import {target}" + ("" if info.get("ok") else f"  FAILED: {info.get('error')}")])
+        for package, value in sorted(info.get("packages_ms", {}).items(), key=lambda item: -(item[1] or 0)):
+            lines.append(f"  {package:<38} {_format_ms(value):>10}")
+        slowest = sorted(info.get("modules_ms", {}).items(), key=lambda item: -(item[1] or 0))[:10]
+        for module, value in slowest:
+            lines.append(f"  {module:<38} {_format_ms(value):>10}  (self)")
+
+    failed = [name for name, info in result.get("sources", {}).items() if not info.get("success")]
+    if failed:
+        lines.extend(["", f"first call failed against the stub: {', '.join(failed)}"])
+    return "\n".join(lines)
+
+
+def _format_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}ms"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure import time and cold start of external_api")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="number of runs per measurement, median is reported")
+    parser.add_argument("--output", type=Path, default=DEFAULT_RESULTS_PATH, help="JSON lines file the result is appended to, default: ./benchmark_results.jsonl")
+    parser.add_argument("--no-save", action="store_true", help="do not append the result to the output file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child_main()
+        return
+
+    result = run_benchmark(max(1, args.repeat))
+    print(format_report(result, find_previous(result, load_results(args.output))))
+    if not args.no_save:
+        save_result(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
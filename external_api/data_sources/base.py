@@ -4,19 +4,27 @@
 类的继承关系:
 BaseApi (基类)
 """
-import inspect
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 import os
 
+from .cache import TTLCache
+from .singleflight import SingleFlight
+from .transport import BaseTransport, get_default_transport
 
-EXCLUDE_METHODS = ['get_capabilities', 'get_api_info', 'source_name', 'get_source_info']
+
+EXCLUDE_METHODS = ['get_capabilities', 'get_api_info', 'source_name', 'get_source_info', 'set_transport', 'get_cache_stats', 'clear_cache']
 
 class BaseAPI(ABC):
     """
     数据源基类
     所有数据源都需要继承此类并实现相关方法
     """
+
+    _transport: Optional[BaseTransport] = None
+    _response_cache: Optional[TTLCache] = None
+    _single_flight: Optional[SingleFlight] = None
+
     @abstractmethod
     def __init__(self, config: Dict[str, Any]):
         """
@@ -47,39 +55,75 @@ class BaseAPI(ABC):
         """
         pass
 
+    def set_transport(self, transport: BaseTransport) -> None:
+        """
+        设置数据源使用的传输层
+
+        Args:
+            transport: BaseTransport, 通常由 ApiClient 持有
+        """
+        self._transport = transport
+
+    async def _request_json(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Any = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        通过传输层发送请求并解析 JSON 响应
+        未绑定传输层时使用全局默认传输层
+
+        Raises:
+            asyncio.TimeoutError: 请求超时
+            TransportError: 连接失败、非 2xx 响应或响应体无法解析
+        """
+        transport = self._transport or get_default_transport()
+        return await transport.request_json(method, url, headers=headers, params=params, json=json, data=data, timeout=timeout)
+
+    def _get_response_cache(self) -> TTLCache:
+        """
+        获取数据源实例的响应缓存, 供 cached 装饰器使用
+        """
+        if self._response_cache is None:
+            self._response_cache = TTLCache()
+        return self._response_cache
+
+    def _get_single_flight(self) -> SingleFlight:
+        """
+        获取数据源实例的请求合并表, 供 coalesced 装饰器使用
+        """
+        if self._single_flight is None:
+            self._single_flight = SingleFlight()
+        return self._single_flight
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        获取响应缓存的命中统计
+
+        Returns:
+            Dict[str, int]: 包含 size, maxsize, hits, misses, evictions
+        """
+        return self._get_response_cache().stats()
+
+    def clear_cache(self) -> None:
+        """
+        清空响应缓存
+        """
+        self._get_response_cache().clear()
+
     def get_capabilities(self) -> List[Dict[str, Any]]:
         """
         获取数据源所有能力的描述
-        通过扫描实例方法及其文档字符串自动获取能力描述
+        通过扫描实例方法及其文档字符串自动获取能力描述, 源码未变化时直接使用能力清单中的结果
 
         Returns:
             List[Dict[str, Any]]: 数据源提供的所有方法的描述列表
         """
-        # 获取所有公开方法（不包括内置方法和私有方法）
-        capabilities = []
-        for attr_name in dir(self):
-            if not attr_name.startswith('_'):  # 排除私有方法
-                attr = getattr(self, attr_name)
-                if callable(attr) and attr_name not in EXCLUDE_METHODS:
-                    # 获取方法的文档字符串
-                    doc = inspect.getdoc(attr)
-                    if not doc:  # 跳过没有文档的方法
-                        continue
-                    if 'raise NotImplementedError' in inspect.getsource(attr):  # 跳过未实现的方法
-                        continue
-                    # 获取方法的签名
-                    sig = inspect.signature(attr)
-                    # 构建能力描述
-                    capability = {
-                        "name": attr_name,
-                        "description": doc.split('\n\n')[0] if doc else "",  # 取第一段作为简短描述
-                        "parameters": {
-                            name: str(param.annotation).replace('typing.', '')
-                            for name, param in sig.parameters.items()
-                            if name != 'self'
-                        },
-                        "return_type": str(sig.return_annotation).replace('typing.', ''),
-                        "doc": doc  # 完整的文档字符串
-                    }
-                    capabilities.append(capability)
-        return capabilities
\ No newline at end of file
+        from .manifest import get_api_manifest
+
+        return get_api_manifest().get_capabilities(type(self))
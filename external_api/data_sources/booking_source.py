@@ -3,16 +3,35 @@ Booking.com flight search data source implementation
 """
 
 import asyncio
+import copy
 import logging
-from datetime import datetime
-from typing import Any, Dict, Optional
-
-import aiohttp
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
 from .base import BaseAPI
+from .cache import PersistentTTLCache, TTLCache, cached
+from .singleflight import coalesced
+from .transport import TransportError
 
 logger = logging.getLogger("booking_source")
 
+# 用于在shell中设置目的地缓存文件路径
+BOOKING_DESTINATION_CACHE_ENV_NAME = "BOOKING_DESTINATION_CACHE"
+DEFAULT_DESTINATION_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "external_api", "booking_destinations.json")
+# 目的地名称与 dest_id 的对应关系基本不变, 缓存 30 天(秒)
+DESTINATION_CACHE_TTL = 30 * 86400
+DESTINATION_CACHE_SIZE = 4096
+# 灵活日期机票搜索: 默认并发数, 单次最多搜索的日期组合数, 以及每个日期组合最低价的缓存时间(秒)
+DEFAULT_FLIGHT_CONCURRENCY = 4
+MAX_FLEXIBLE_FLIGHT_SEARCHES = 60
+FLIGHT_FARE_CACHE_TTL = 300
+# 酒店详情(含房态)按酒店、日期及入住人数缓存的时间(秒), 以及批量获取时的默认并发数
+HOTEL_DETAILS_CACHE_TTL = 600
+DEFAULT_HOTEL_DETAILS_CONCURRENCY = 8
+
+_MISSING = object()
+
 
 class BookingSource(BaseAPI):
     """Booking.com data source"""
@@ -29,6 +48,12 @@ class BookingSource(BaseAPI):
             "X-Biz-Id": "matrix-agent",
             "X-Request-Timeout": str(config["timeout"] - 5),
         }
+        self._destination_cache_path = (
+            config.get("booking_destination_cache") or os.getenv(BOOKING_DESTINATION_CACHE_ENV_NAME) or DEFAULT_DESTINATION_CACHE_PATH
+        )
+        self._destination_cache: Optional[PersistentTTLCache] = None
+        # 灵活日期搜索中各日期组合的最低价航班, 票价变化快, 只短时间缓存
+        self._fare_cache = TTLCache(ttl=FLIGHT_FARE_CACHE_TTL)
 
     @property
     def source_name(self) -> str:
@@ -160,17 +185,12 @@ class BookingSource(BaseAPI):
 
             # Send request
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        # Check response status
-                        response.raise_for_status()
-                        data = await response.json()
-
+                data = await self._request_json("GET", request_url, headers=self.headers, params=params, timeout=self._timeout)
             except asyncio.TimeoutError:
                 error_msg = f"Request timeout (timeout={self._timeout}s)"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
-            except aiohttp.ClientError as e:
+            except TransportError as e:
                 error_msg = f"Request failed: {str(e)}"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
@@ -233,6 +253,169 @@ class BookingSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    async def search_flights_flexible(
+        self,
+        from_code: str,
+        to_code: str,
+        depart_date_from: str,
+        depart_date_to: str,
+        return_date_from: Optional[str] = None,
+        return_date_to: Optional[str] = None,
+        stops: str = "none",
+        adults: int = 1,
+        cabin_class: str = "ECONOMY",
+        currency_code: str = "USD",
+        max_concurrency: int = DEFAULT_FLIGHT_CONCURRENCY,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Search the cheapest flights for every combination of dates in a departure/return date window
+
+        All date combinations are searched concurrently under one deadline, combinations that fail or miss the deadline
+        are reported in failed. At most 60 combinations can be searched at once.
+
+        Args:
+            from_code(str): Departure airport code, e.g.: PEK
+            to_code(str): Destination airport code, e.g.: CAN
+            depart_date_from(str): First departure date, format: YYYY-MM-DD
+            depart_date_to(str): Last departure date, format: YYYY-MM-DD
+            return_date_from(Optional[str]): First return date, format: YYYY-MM-DD, omit for one-way flights
+            return_date_to(Optional[str]): Last return date, format: YYYY-MM-DD, defaults to return_date_from
+            stops(str): Number of stops, options: none, 0, 1, 2
+            adults(int): Number of adults, default is 1
+            cabin_class(str): Cabin class, options: ECONOMY, PREMIUM_ECONOMY, BUSINESS, FIRST
+            currency_code(str): Currency code, default USD
+            max_concurrency(int): Maximum number of concurrent searches, default is 4
+            timeout(Optional[float]): Deadline in seconds for the whole search, default: None (use the request timeout)
+
+        Returns:
+            Dict[str, Any]: Dictionary containing the fare matrix, e.g.
+            {
+                "success": True,                   # True if at least one combination was searched
+                "data": {
+                    "depart_dates": ["2025-04-19", "2025-04-20"],  # Matrix rows
+                    "return_dates": ["2025-04-26", "2025-04-27"],  # Matrix columns, [] for one-way flights
+                    "fares": [                     # Lowest total price per combination, None if no flight or not searched
+                        [1420.5, 1388.0],          # One column per return date, a single column for one-way flights
+                        [None, 1502.3]
+                    ],
+                    "cheapest": {                  # Cheapest combination, None if no flight was found
+                        "depart_date": "2025-04-19",
+                        "return_date": "2025-04-27",
+                        "flight": {...}            # Same format as the items of search_flights()["data"]["flights"]
+                    },
+                    "failed": [                    # Combinations that failed
+                        {"depart_date": "2025-04-20", "return_date": "2025-04-26", "error": "Request timeout (timeout=60s)"}
+                    ]
+                }
+            }
+        """
+        # Example:
+        #     >>> from external_api.data_sources.client import get_client
+        #     >>> client = get_client()
+        #     >>> result = await client.booking.search_flights_flexible(
+        #     ...     from_code="PEK",
+        #     ...     to_code="CAN",
+        #     ...     depart_date_from="2025-04-19",
+        #     ...     depart_date_to="2025-04-21",
+        #     ...     return_date_from="2025-04-26",
+        #     ...     return_date_to="2025-04-28"
+        #     ... )
+        #     >>> if result["success"] and result["data"]["cheapest"]:
+        #     ...     print(result["data"]["cheapest"]["depart_date"], result["data"]["cheapest"]["flight"]["price"])
+        # """
+        try:
+            depart_dates = self._date_range(depart_date_from, depart_date_to)
+            return_dates = self._date_range(return_date_from, return_date_to or return_date_from) if return_date_from else []
+        except ValueError as e:
+            return {"success": False, "error": f"Invalid date range: {str(e)}"}
+
+        # 票价矩阵的列, 单程搜索只有一列, 返程日期为 None
+        columns: List[Optional[str]] = list(return_dates) if return_dates else [None]
+        # 返程日期早于出发日期的组合不搜索
+        combinations: List[Tuple[str, Optional[str]]] = [
+            (depart, ret) for depart in depart_dates for ret in columns if ret is None or ret >= depart
+        ]
+        if not combinations:
+            return {"success": False, "error": "No valid date combination in the given window"}
+        if len(combinations) > MAX_FLEXIBLE_FLIGHT_SEARCHES:
+            return {
+                "success": False,
+                "error": f"Too many date combinations ({len(combinations)}), at most {MAX_FLEXIBLE_FLIGHT_SEARCHES} are allowed",
+            }
+
+        deadline = self._timeout if timeout is None else timeout
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def fetch(depart: str, ret: Optional[str]) -> Dict[str, Any]:
+            key = (from_code, to_code, depart, ret, stops, adults, cabin_class, currency_code)
+            cheapest = self._fare_cache.get(key, _MISSING)
+            if cheapest is not _MISSING:
+                # 与 cached 相同, 调用方修改返回的航班不影响缓存
+                return {"success": True, "data": copy.deepcopy(cheapest)}
+            async with semaphore:
+                result = await self.search_flights(
+                    from_code=from_code,
+                    to_code=to_code,
+                    depart_date=depart,
+                    return_date=ret,
+                    stops=stops,
+                    adults=adults,
+                    sort="CHEAPEST",
+                    cabin_class=cabin_class,
+                    currency_code=currency_code,
+                )
+            if not result["success"]:
+                return result
+            cheapest = min(result["data"]["flights"], key=lambda flight: flight["price"]["amount"], default=None)
+            self._fare_cache.set(key, copy.deepcopy(cheapest))
+            return {"success": True, "data": cheapest}
+
+        tasks = {combination: asyncio.ensure_future(fetch(*combination)) for combination in combinations}
+        try:
+            _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+
+        fares: List[List[Optional[float]]] = [[None] * len(columns) for _ in depart_dates]
+        cheapest_overall: Optional[Dict[str, Any]] = None
+        failed = []
+        for (depart, ret), task in tasks.items():
+            if task in pending:
+                error = f"Request timeout (timeout={deadline}s)"
+            elif task.exception() is not None:
+                logger.error(f"Error occurred while searching flights on {depart}/{ret}: {str(task.exception())}", exc_info=task.exception())
+                error = str(task.exception())
+            elif not task.result()["success"]:
+                error = task.result()["error"]
+            else:
+                flight = task.result()["data"]
+                if flight is not None:
+                    fares[depart_dates.index(depart)][columns.index(ret)] = flight["price"]["amount"]
+                    if cheapest_overall is None or flight["price"]["amount"] < cheapest_overall["flight"]["price"]["amount"]:
+                        cheapest_overall = {"depart_date": depart, "return_date": ret, "flight": flight}
+                continue
+            failed.append({"depart_date": depart, "return_date": ret, "error": error})
+
+        if len(failed) == len(tasks):
+            error_msg = "All flight searches failed:\n" + "\n".join(
+                [f"{item['depart_date']}/{item['return_date']}: {item['error']}" for item in failed]
+            )
+            return {"success": False, "error": error_msg}
+
+        return {
+            "success": True,
+            "data": {
+                "depart_dates": depart_dates,
+                "return_dates": return_dates,
+                "fares": fares,
+                "cheapest": cheapest_overall,
+                "failed": failed,
+            },
+        }
+
     async def _search_hotel_destinations(self, query: str) -> Dict[str, Any]:
         """
         Search for hotel destinations
@@ -280,17 +463,12 @@ class BookingSource(BaseAPI):
 
             # 发送请求
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        # 检查响应状态
-                        response.raise_for_status()
-                        data = await response.json()
-
+                data = await self._request_json("GET", request_url, headers=self.headers, params=params, timeout=self._timeout)
             except asyncio.TimeoutError:
                 error_msg = f"Request timeout (timeout={self._timeout}s)"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
-            except aiohttp.ClientError as e:
+            except TransportError as e:
                 error_msg = f"Request failed: {str(e)}"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
@@ -449,17 +627,12 @@ class BookingSource(BaseAPI):
 
             # 发送请求
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        # 检查响应状态
-                        response.raise_for_status()
-                        data = await response.json()
-
+                data = await self._request_json("GET", request_url, headers=self.headers, params=params, timeout=self._timeout)
             except asyncio.TimeoutError:
                 error_msg = f"Request timeout (timeout={self._timeout}s)"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
-            except aiohttp.ClientError as e:
+            except TransportError as e:
                 error_msg = f"Request failed: {str(e)}"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
@@ -595,16 +768,12 @@ class BookingSource(BaseAPI):
         #     ...     print(f"Search successful")
         # """
         try:
-            # 先搜索目的地信息
-            dest_result = await self._search_hotel_destinations(dest_name)
+            # 先解析目的地信息, 已缓存的目的地不再请求
+            dest_result = await self._resolve_destination(dest_name)
             if not dest_result["success"]:
                 return dest_result
 
-            if not dest_result["data"]["destinations"]:
-                return {"success": False, "error": f"No matching destination found: {dest_name}"}
-
-            # 使用第一个匹配的目的地
-            destination = dest_result["data"]["destinations"][0]
+            destination = dest_result["data"]
             dest_id = destination["dest_id"]
             search_type = destination["search_type"].upper()
 
@@ -648,6 +817,55 @@ class BookingSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    async def _resolve_destination(self, dest_name: str) -> Dict[str, Any]:
+        """
+        解析目的地名称, 使用第一个匹配的目的地
+
+        结果按接口地址及规范化的名称(忽略大小写及多余空白)缓存并持久化到磁盘, 查询失败或无匹配时不缓存
+
+        Returns:
+            Dict[str, Any]: 成功时 data 包含 name, dest_id, search_type
+        """
+        name = " ".join(dest_name.casefold().split())
+        destination = self._get_destination_cache().get(self._destination_cache_key(name))
+        if destination is None:
+            dest_result = await self._lookup_destination(name)
+            if not dest_result["success"]:
+                return dest_result
+            destination = dest_result["data"]
+            if destination is None:
+                return {"success": False, "error": f"No matching destination found: {dest_name}"}
+        return {"success": True, "data": dict(destination)}
+
+    @coalesced
+    async def _lookup_destination(self, name: str) -> Dict[str, Any]:
+        """查询规范化名称对应的目的地并写入缓存, 无匹配时 data 为 None"""
+        dest_result = await self._search_hotel_destinations(name)
+        if not dest_result["success"]:
+            return dest_result
+        if not dest_result["data"]["destinations"]:
+            return {"success": True, "data": None}
+
+        first = dest_result["data"]["destinations"][0]
+        destination = {"name": first["name"], "dest_id": first["dest_id"], "search_type": first["search_type"]}
+        self._get_destination_cache().set(self._destination_cache_key(name), destination)
+        return {"success": True, "data": destination}
+
+    def _destination_cache_key(self, name: str) -> str:
+        """缓存文件可能被指向不同网关或接口的进程共用, 键中包含接口地址"""
+        return f"{self.proxy_url}|{self.headers['X-Original-Host']}|{name}"
+
+    def _get_destination_cache(self) -> PersistentTTLCache:
+        """获取目的地缓存, 首次使用时读取缓存文件"""
+        if self._destination_cache is None:
+            self._destination_cache = PersistentTTLCache(
+                self._destination_cache_path, maxsize=DESTINATION_CACHE_SIZE, ttl=DESTINATION_CACHE_TTL
+            )
+        return self._destination_cache
+
+    # 详情较大, 以 JSON 文本缓存, search_hotels_details 批量命中时避免逐个深拷贝
+    @cached(ttl=HOTEL_DETAILS_CACHE_TTL, as_json=True)
+    @coalesced
     async def search_hotel_details(
         self,
         hotel_id: str,
@@ -767,17 +985,12 @@ class BookingSource(BaseAPI):
             request_url = f"{self.proxy_url}/api/v1/hotels/getHotelDetails"
 
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        # 检查响应状态
-                        response.raise_for_status()
-                        data = await response.json()
-
+                data = await self._request_json("GET", request_url, headers=self.headers, params=params, timeout=self._timeout)
             except asyncio.TimeoutError:
                 error_msg = f"Request timeout (timeout={self._timeout}s)"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
-            except aiohttp.ClientError as e:
+            except TransportError as e:
                 error_msg = f"Request failed: {str(e)}"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
@@ -796,6 +1009,102 @@ class BookingSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    async def search_hotels_details(
+        self,
+        hotel_ids: List[str],
+        arrival_date: str,
+        departure_date: str,
+        adults: int = 1,
+        children_age: Optional[str] = None,
+        room_qty: int = 1,
+        units: str = "metric",
+        temperature_unit: str = "c",
+        languagecode: str = "en-us",
+        currency_code: str = "EUR",
+        max_concurrency: int = DEFAULT_HOTEL_DETAILS_CONCURRENCY,
+    ) -> Dict[str, Any]:
+        """
+        Search for the details of several hotels with the same dates, e.g. to compare hotels from search results
+
+        Hotels are fetched concurrently, and details fetched recently for the same dates and occupancy are served from cache.
+
+        Args:
+            hotel_ids(List[str]): Hotel IDs, duplicates are fetched once
+            arrival_date(str): Check-in date, format: YYYY-MM-DD
+            departure_date(str): Check-out date, format: YYYY-MM-DD
+            adults(int): Number of adults, default is 1
+            children_age(Optional[str]): Children's ages, comma separated, e.g.: 0,17
+            room_qty(int): Number of rooms, default is 1
+            units(str): Units, default is metric
+            temperature_unit(str): Temperature unit, default is c, options: c or f, where c = Celsius, f = Fahrenheit
+            languagecode(str): Language code, default en-us
+            currency_code(str): Currency code, default EUR
+            max_concurrency(int): Maximum number of concurrent requests, default is 8
+
+        Returns:
+            Dict[str, Any]: Dictionary containing hotel details, e.g.
+            {
+                "success": True,                   # True if at least one hotel was retrieved
+                "data": {
+                    "hotels": [                    # In the order of hotel_ids, same format as search_hotel_details()["data"]["data"]
+                        {"hotel_id": 191605, "hotel_name": "Novotel Mumbai Juhu Beach", ...}
+                    ],
+                    "failed": [                    # Hotels that could not be retrieved
+                        {"hotel_id": "123", "error": "Request timeout (timeout=60s)"}
+                    ]
+                }
+            }
+        """
+        # Example:
+        #     >>> from external_api.data_sources.client import get_client
+        #     >>> client = get_client()
+        #     >>> result = await client.booking.search_hotels_details(
+        #     ...     hotel_ids=["191605", "74717"],
+        #     ...     arrival_date="2025-04-26",
+        #     ...     departure_date="2025-04-27"
+        #     ... )
+        #     >>> for hotel in result["data"]["hotels"]:
+        #     ...     print(hotel["hotel_name"], hotel["rating"])
+        # """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def fetch(hotel_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.search_hotel_details(
+                    hotel_id=hotel_id,
+                    arrival_date=arrival_date,
+                    departure_date=departure_date,
+                    adults=adults,
+                    children_age=children_age,
+                    room_qty=room_qty,
+                    units=units,
+                    temperature_unit=temperature_unit,
+                    languagecode=languagecode,
+                    currency_code=currency_code,
+                )
+
+        # 统一为字符串, 相同酒店只请求一次, 也使缓存键一致
+        ids = list(dict.fromkeys(str(hotel_id) for hotel_id in hotel_ids))
+        results = await asyncio.gather(*[fetch(hotel_id) for hotel_id in ids], return_exceptions=True)
+
+        hotels = []
+        failed = []
+        for hotel_id, result in zip(ids, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error occurred while searching details of hotel {hotel_id}: {str(result)}", exc_info=result)
+                failed.append({"hotel_id": hotel_id, "error": str(result) or type(result).__name__})
+            elif not result["success"]:
+                failed.append({"hotel_id": hotel_id, "error": result["error"]})
+            else:
+                # search_hotel_details 的 data 中还包了一层 {"success": True, "data": 酒店详情}
+                hotels.append(result["data"]["data"])
+
+        if ids and not hotels:
+            error_msg = "All hotel detail searches failed:\n" + "\n".join([f"{item['hotel_id']}: {item['error']}" for item in failed])
+            return {"success": False, "error": error_msg}
+
+        return {"success": True, "data": {"hotels": hotels, "failed": failed}}
+
     def _parse_hotel_detail(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """解析酒店详情"""
         facilities = []
@@ -883,6 +1192,15 @@ class BookingSource(BaseAPI):
         }
         return {"success": True, "data": hotel_detail}
 
+    @staticmethod
+    def _date_range(start_date: str, end_date: str) -> List[str]:
+        """生成 start_date 到 end_date(含)之间的所有日期, 格式 YYYY-MM-DD"""
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+        if end < start:
+            raise ValueError(f"{end_date} is before {start_date}")
+        return [(start + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range((end - start).days + 1)]
+
     def _format_duration(self, seconds: int) -> str:
         """Convert seconds to hours and minutes format"""
         hours = seconds // 3600
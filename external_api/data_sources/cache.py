@@ -0,0 +1,248 @@
+"""
+数据源响应缓存
+
+提供带过期时间的 LRU 缓存, 以及用于幂等数据源方法的 cached 装饰器
+"""
+
+import copy
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger("data_sources_cache")
+
+# 每个数据源实例响应缓存的默认条目上限
+DEFAULT_CACHE_SIZE = 256
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    带过期时间的 LRU 缓存
+
+    条目超过 ttl 秒后失效, 条目数超过 maxsize 时淘汰最久未使用的条目
+    """
+
+    # 过期时间使用的时钟
+    _clock = staticmethod(time.monotonic)
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        获取缓存值, 不存在或已过期时返回 default
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        写入缓存值
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: 过期时间(秒), 默认使用缓存的 ttl
+        """
+        with self._lock:
+            self._data[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        """删除缓存值"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存, 保留统计计数"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取缓存统计
+
+        Returns:
+            Dict[str, int]: 包含 size, maxsize, hits, misses, evictions
+        """
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class PersistentTTLCache(TTLCache):
+    """
+    持久化到 JSON 文件的 TTLCache
+
+    键为字符串, 值需可 JSON 序列化; 过期时间按墙上时间保存, 进程重启后仍然有效。
+    创建时读取文件, 每次写入后原子地写回文件; 文件不可读写时只作为内存缓存使用。
+    多个进程同时写入时以最后写入的为准, 丢失的条目只会导致一次重新查询
+    """
+
+    _clock = staticmethod(time.time)
+
+    def __init__(self, path: str, maxsize: int = DEFAULT_CACHE_SIZE, ttl: float = 300):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.path = path
+        self._load()
+
+    def _load(self) -> None:
+        now = self._clock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            data = OrderedDict((key, (expires_at, value)) for key, expires_at, value in entries[-self.maxsize :] if expires_at > now)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"读取缓存文件 {self.path} 失败: {str(e)}")
+            return
+        with self._lock:
+            self._data = data
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        super().set(key, value, ttl=ttl)
+        self.save()
+
+    def pop(self, key: Hashable) -> None:
+        super().pop(key)
+        self.save()
+
+    def clear(self) -> None:
+        super().clear()
+        self.save()
+
+    def save(self) -> None:
+        """将未过期的条目按最近使用顺序写入文件"""
+        now = self._clock()
+        with self._lock:
+            entries = [[key, expires_at, value] for key, (expires_at, value) in self._data.items() if expires_at > now]
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"写入缓存文件 {self.path} 失败: {str(e)}")
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    将参数值转换为可哈希的规范形式, dict 按键排序, list/set 转为 tuple
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        # 元素类型可能各不相同, 按 repr 排序
+        return tuple(sorted((freeze(v) for v in value), key=repr))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def make_call_key(func: Callable, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Hashable:
+    """
+    按函数签名绑定参数并补全默认值, 生成与传参方式无关的调用键
+
+    Args:
+        func: 被调用的函数
+        args: 位置参数, 不包含 self
+        kwargs: 关键字参数
+
+    Returns:
+        Hashable: 调用键
+    """
+    signature = _get_signature(func)
+    arguments: List[Tuple[Any, Any]]
+    try:
+        bound = signature.bind_partial(None, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = list(bound.arguments.items())[1:]
+    except TypeError:
+        arguments = list(enumerate(args)) + sorted(kwargs.items())
+    return (func.__name__, freeze(arguments))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_signature(func: Callable) -> inspect.Signature:
+    return inspect.signature(func)
+
+
+def cached(ttl: float, as_json: bool = False) -> Callable:
+    """
+    缓存幂等数据源方法的成功结果
+
+    结果按 (方法名, 规范化参数) 存入数据源实例的响应缓存, 只缓存 success 为 True 的结果,
+    命中时返回深拷贝, 调用方修改返回值不会影响缓存
+
+    Args:
+        ttl: 结果的过期时间(秒)
+        as_json: 以 JSON 文本存储结果, 命中时重新解析。缓存内容不可变, 解析比深拷贝快数倍,
+            适用于结果较大且可无损往返 JSON 的方法; 无法序列化的结果仍按深拷贝存储
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            cache = self._get_response_cache()
+            key = make_call_key(func, args, kwargs)
+            result = cache.get(key, _MISSING)
+            if result is not _MISSING:
+                # 结果本身总是 dict, 字符串即 JSON 形式的条目
+                return json.loads(result) if isinstance(result, str) else copy.deepcopy(result)
+
+            result = await func(self, *args, **kwargs)
+            if isinstance(result, dict) and result.get("success"):
+                cache.set(key, _freeze_result(result, as_json), ttl=ttl)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _freeze_result(result: Dict[str, Any], as_json: bool) -> Any:
+    if as_json:
+        try:
+            return json.dumps(result, ensure_ascii=False)
+        except (TypeError, ValueError):
+            pass
+    return copy.deepcopy(result)
@@ -2,22 +2,24 @@
 统一的数据源访问客户端
 """
 
+import atexit
 import importlib
-import inspect
 import logging
 import os
 import pkgutil
 import threading
 from enum import Enum
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
-from docstring_parser import parse
-
-from .base import EXCLUDE_METHODS, BaseAPI
+from .base import BaseAPI
+from .manifest import get_api_manifest
+from .transport import create_transport
 
 # 用于在shell中设置LLM_GATEWAY_BASE_URL环境变量
 LLM_GATEWAY_BASE_URL_ENV_NAME = "LLM_GATEWAY_BASE_URL"
+# 用于在shell中设置数据源使用的HTTP传输层
+EXTERNAL_API_TRANSPORT_ENV_NAME = "EXTERNAL_API_TRANSPORT"
 
 logger = logging.getLogger("data_sources_client")
 
@@ -39,6 +41,8 @@ config = {
     "serper_base_url": "google.serper.dev",
     "external_api_proxy_url": get_external_api_proxy_url(),
     "timeout": 60,
+    # HTTP传输层实现: aiohttp 或 httpx, 可通过环境变量切换以便对比测试
+    "transport": os.getenv(EXTERNAL_API_TRANSPORT_ENV_NAME) or "aiohttp",
 }
 
 
@@ -47,12 +51,32 @@ class ApiType(Enum):
     FUNCTION = "function"
 
 
+# 数据源清单: 名称 -> (模块名, 类名)
+# 客户端创建时只登记清单, 模块在首次访问对应数据源时才导入并创建实例;
+# 目录下未登记的 *_source / *_function 模块在需要完整列表或按名称查找失败时再扫描加载
+API_MANIFEST: Dict[ApiType, Dict[str, Tuple[str, str]]] = {
+    ApiType.DATA_SOURCE: {
+        "booking": ("booking_source", "BookingSource"),
+        "commodities": ("commodities_source", "CommoditiesSource"),
+        "metal": ("metal_source", "MetalSource"),
+        "patent": ("patents_source", "PatentSource"),
+        "pinterest": ("pinterest_source", "PinterestSource"),
+        "scholar": ("scholar_source", "ScholarSource"),
+        "tripadvisor": ("tripadvisor_source", "TripAdvisorSource"),
+        "twitter": ("twitter_source", "TwitterSource"),
+        "yahoo_finance": ("yahoo_source", "YahooFinanceSource"),
+    },
+    ApiType.FUNCTION: {},
+}
+
+
 class ApiClient:
     """
     统一的数据源访问客户端
     负责管理和调用所有数据源
 
     使用单例模式，全局只初始化一次，线程安全
+    数据源按清单延迟加载, 首次访问时才导入模块并创建实例
     """
 
     _exclude_sources = []
@@ -78,19 +102,73 @@ class ApiClient:
                 return
             self._sources: Dict[str, BaseAPI] = {}
             self._functions: Dict[str, BaseAPI] = {}
-            self._load_data_sources()
+            self._manifest = {api_type: dict(entries) for api_type, entries in API_MANIFEST.items()}
+            self._discovered = False
+            self._load_lock = threading.RLock()
+            # 所有数据源共享的HTTP传输层，进程退出时统一关闭
+            self._transport = create_transport(config["transport"], timeout=config["timeout"])
+            atexit.register(self._transport.shutdown)
             self._initialized = True
 
-    def _load_data_sources(self):
+    def _get_api(self, api_type: ApiType, api_name: str) -> Optional[BaseAPI]:
+        """
+        获取数据源实例, 首次访问时按清单导入模块并创建实例
+
+        Returns:
+            Optional[BaseAPI]: 数据源实例, 不存在或加载失败时返回 None
+        """
+        instances = self._sources if api_type == ApiType.DATA_SOURCE else self._functions
+        api = instances.get(api_name)
+        if api is not None:
+            return api
+
+        with self._load_lock:
+            api = instances.get(api_name)
+            if api is not None:
+                return api
+            if api_name not in self._manifest[api_type]:
+                self._discover_modules()
+            entry = self._manifest[api_type].get(api_name)
+            if entry is None:
+                return None
+            module_name, class_name = entry
+            if class_name in self._exclude_sources:
+                return None
+            try:
+                module = importlib.import_module(f".{module_name}", package="external_api.data_sources")
+                api = getattr(module, class_name)(config)
+                api.set_transport(self._transport)
+                instances[api_name] = api
+            except Exception as e:
+                logger.error(f"加载数据源模块 {module_name} 失败: {str(e)}\n")
+                logger.exception(e)
+            return api
+
+    def _get_api_names(self, api_type: ApiType) -> List[str]:
+        """获取某类数据源的全部名称, 包括目录下未登记在清单中的模块"""
+        with self._load_lock:
+            self._discover_modules()
+            return list(self._manifest[api_type])
+
+    def _discover_modules(self):
         """
-        动态加载所有可用的数据源
-        通过扫描data_sources目录下的所有模块来加载数据源
+        扫描data_sources目录, 加载未登记在清单中的 *_source / *_function 模块
+        只执行一次, 已登记的模块不会被导入
         """
+        if self._discovered:
+            return
+        self._discovered = True
+
+        listed_modules = {module_name for entries in self._manifest.values() for module_name, _ in entries.values()}
         current_dir = Path(__file__).parent
         for module_info in pkgutil.iter_modules([str(current_dir)]):
-            type_dict = self._sources
+            if module_info.name in listed_modules:
+                continue
+            api_type = ApiType.DATA_SOURCE
+            instances = self._sources
             if module_info.name.endswith("_function"):
-                type_dict = self._functions
+                api_type = ApiType.FUNCTION
+                instances = self._functions
             elif not module_info.name.endswith("_source"):
                 continue
 
@@ -102,14 +180,23 @@ class ApiClient:
                         isinstance(item, type)
                         and issubclass(item, BaseAPI)
                         and item != BaseAPI
+                        and item.__module__ == module.__name__
                         and item.__name__ not in self._exclude_sources
                     ):
                         source = item(config)
-                        type_dict[source.source_name] = source
+                        source.set_transport(self._transport)
+                        instances[source.source_name] = source
+                        self._manifest[api_type][source.source_name] = (module_info.name, item.__name__)
             except Exception as e:
                 logger.error(f"加载数据源模块 {module_info.name} 失败: {str(e)}\n")
                 logger.exception(e)
 
+    async def close(self):
+        """
+        Close the shared HTTP connections of the current event loop
+        """
+        await self._transport.close()
+
     def get_function_desc(self, function_name: str) -> str:
         """
         Get a brief description and usage example of the specified function
@@ -145,86 +232,21 @@ class ApiClient:
         Returns:
             str: Readable description of the data source and its API
         """
-        output_lines = ["# Available data sources (refer to the python code examples, write python code to call them)\n"]
-
-        # Directly use the mapping value to get the data source instance
-        if api_type == ApiType.DATA_SOURCE:
-            api = self._sources.get(api_name)
-        else:
-            api = self._functions.get(api_name)
-
-        if not api:
+        entry = self._get_manifest_entry(api_type, api_name)
+        desc = None
+        if entry is not None:
+            module_name, class_name = entry
+            desc = get_api_manifest().get_desc(module_name, class_name, api_name, lambda: self._get_api(api_type, api_name))
+        if desc is None:
             return f"# {api_type.value} {api_name} does not exist"
+        return desc
 
-        api_info = api.get_api_info()
-
-        # Add data source title and description
-        display_name = api_info.get("name", api_name)
-        source_desc = api_info.get("description", "No description available")
-        output_lines.extend([f"## {display_name}", f"{source_desc}\n"])
-
-        # Get data source methods
-        apis = []
-        for method_name, method in inspect.getmembers(api.__class__, predicate=inspect.isfunction):
-            # Skip internal methods
-            if method_name.startswith("_") or method_name in EXCLUDE_METHODS:
-                continue
-
-            # Get method docstring
-            doc = inspect.getdoc(method)
-            if not doc:
-                continue
-
-            # Parse docstring
-            docstring = parse(doc)
-
-            # Prepare method description
-            method_lines = [f"### {method_name}"]
-            if docstring.short_description:
-                method_lines.append(docstring.short_description + "\n")
-
-            # Add parameter description
-            if docstring.params:
-                method_lines.append("**Parameters:**")
-                for param in docstring.params:
-                    param_desc = f"- `{param.arg_name}`"
-                    if param.type_name:
-                        param_desc += f": {param.type_name}"
-                    if param.description:
-                        param_desc += f" - {param.description}"
-                    method_lines.append(param_desc)
-                method_lines.append("")
-
-            # Add return value description
-            if docstring.returns:
-                method_lines.append("**Returns:**")
-                if docstring.returns.type_name:
-                    method_lines.append(f"Type: `{docstring.returns.type_name}`")
-                if docstring.returns.description:
-                    method_lines.append("```")
-                    method_lines.append(docstring.returns.description)
-                    method_lines.append("```")
-                method_lines.append("")
-
-            # Add example
-            if docstring.examples:
-                method_lines.append("**Example:**")
-                method_lines.append("```python")
-                for example in docstring.examples:
-                    if example.description:
-                        # Directly add example code, no processing
-                        method_lines.append(example.description.strip())
-                method_lines.append("```")
-                method_lines.append("")
-
-            apis.extend(method_lines)
-
-        # Merge all method descriptions
-        if apis:
-            output_lines.extend(apis)
-        output_lines.append("---\n")
-
-        return "\n".join(output_lines)
+    def _get_manifest_entry(self, api_type: ApiType, api_name: str) -> Optional[Tuple[str, str]]:
+        """获取数据源在清单中的 (模块名, 类名), 未登记时先扫描目录"""
+        with self._load_lock:
+            if api_name not in self._manifest[api_type]:
+                self._discover_modules()
+            return self._manifest[api_type].get(api_name)
 
     def get_data_sources_basic_info(self) -> Dict[str, Dict[str, str]]:
         """
@@ -235,11 +257,14 @@ class ApiClient:
         """
         result = {}
 
-        for name, source in self._sources.items():
+        for name in self._get_api_names(ApiType.DATA_SOURCE):
             # yahoo_finance和twitter 已通过 tool 实现，这里不展示
             if name in ["yahoo_finance", "twitter", "booking", "pinterest", "tripadvisor"]:
                 continue
 
+            source = self._get_api(ApiType.DATA_SOURCE, name)
+            if source is None:
+                continue
             source_info = source.get_api_info()
 
             # Get display name and description
@@ -256,7 +281,7 @@ class ApiClient:
         获取所有数据源的所有方法的描述
         """
         result = []
-        for function_name, function in self._functions.items():
+        for function_name in self._get_api_names(ApiType.FUNCTION):
             result.append(self.get_function_desc(function_name))
         return "\n".join(result)
 
@@ -273,9 +298,12 @@ class ApiClient:
         Raises:
             AttributeError: data source does not exist
         """
-        if name not in self._sources:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        source = self._get_api(ApiType.DATA_SOURCE, name)
+        if source is None:
             raise AttributeError(f"Data source {name} does not exist")
-        return self._sources[name]
+        return source
 
 
 # 全局默认实例
@@ -7,12 +7,16 @@ import json
 import logging
 from typing import Any, Dict, Optional
 
-import aiohttp
-
 from .base import BaseAPI
+from .cache import cached
+from .singleflight import coalesced
+from .transport import TransportError
 
 logger = logging.getLogger("commodities_source")
 
+# 支持的商品与币种列表几乎不变, 缓存一天(秒)
+SUPPORTED_COMMODITIES_CACHE_TTL = 86400
+
 
 class CommoditiesSource(BaseAPI):
     """Commodity price data source"""
@@ -45,6 +49,8 @@ class CommoditiesSource(BaseAPI):
             "description": "Commodity price data source, provides price information for commodities such as COCOA, COFFEE, CORN, OIL, SOYBEAN, SUGAR, WHEAT, etc.",
         }
 
+    @cached(ttl=SUPPORTED_COMMODITIES_CACHE_TTL)
+    @coalesced
     async def get_supported_commodities(self) -> Dict[str, Any]:
         """Get the list of supported commodities.
         This method is used to get the list of commodities that can be queried.
@@ -83,13 +89,8 @@ class CommoditiesSource(BaseAPI):
         try:
             request_url = f"{self.proxy_url}/v1/supported"
 
-            # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self._headers, timeout=self._timeout) as response:
-                    response.raise_for_status()
-
-                    # Parse the response
-                    data = await response.json(content_type=None)
+            # Send request
+            data = await self._request_json("GET", request_url, headers=self._headers, timeout=self._timeout)
 
             if isinstance(data, str):
                 data = json.loads(data)
@@ -109,7 +110,7 @@ class CommoditiesSource(BaseAPI):
             error_msg = f"Request timeout (timeout={self._timeout}s)"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             error_msg = f"HTTP request error: {str(e)}"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
@@ -170,13 +171,8 @@ class CommoditiesSource(BaseAPI):
 
             request_url = f"{self.proxy_url}/v1/market-data"
 
-            # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self._headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-
-                    # Parse the response
-                    data = await response.json(content_type=None)
+            # Send request
+            data = await self._request_json("GET", request_url, headers=self._headers, params=params, timeout=self._timeout)
 
             if isinstance(data, str):
                 data = json.loads(data)
@@ -193,7 +189,7 @@ class CommoditiesSource(BaseAPI):
             error_msg = f"Request timeout (timeout={self._timeout}s)"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             error_msg = f"HTTP request error: {str(e)}"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
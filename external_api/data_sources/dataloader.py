@@ -0,0 +1,104 @@
+"""
+按键批量加载(DataLoader)
+
+同一事件循环轮次内发起的 load 调用合并为一批, 批内去重后交给批量加载函数,
+每个键的结果在加载器的生命周期内缓存, 通常每个请求创建一个加载器
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence, Set
+
+
+class DataLoader:
+    """
+    批量加载器
+
+    batch_fn 接收一批互不相同的键, 返回与键一一对应的结果列表。
+    batch_fn 抛出异常时该批所有调用方收到该异常, 这些键不缓存, 之后再次 load 会重新加载。
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Hashable]], Awaitable[Sequence[Any]]], max_batch_size: Optional[int] = None):
+        self._batch_fn = batch_fn
+        self._max_batch_size = max_batch_size
+        self._results: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._queue: List[Hashable] = []
+        self._scheduled = False
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self.batches = 0
+        self.loaded = 0
+        self.requested = 0
+
+    async def load(self, key: Hashable) -> Any:
+        """
+        加载单个键, 已加载或正在加载的键直接复用结果
+        """
+        self.requested += 1
+        future = self._results.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._results[key] = future
+            self._queue.append(key)
+            if not self._scheduled:
+                # 在本轮已就绪的回调之后分发, 同一轮次内的 load 调用进入同一批
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        # 单个调用方取消不影响共享同一结果的其他调用方
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Sequence[Hashable]) -> List[Any]:
+        """
+        加载多个键, 返回与 keys 顺序一致的结果
+        """
+        return list(await asyncio.gather(*[self.load(key) for key in keys]))
+
+    def clear(self, key: Optional[Hashable] = None) -> None:
+        """清除单个键或全部已缓存的结果, 正在加载的键不受影响"""
+        keys = [key] if key is not None else list(self._results)
+        for item in keys:
+            future = self._results.get(item)
+            if future is not None and future.done():
+                del self._results[item]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取加载统计
+
+        Returns:
+            Dict[str, int]: 包含 requested(load 调用数), loaded(实际加载的键数), batches(批次数)
+        """
+        return {"requested": self.requested, "loaded": self.loaded, "batches": self.batches}
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        self._scheduled = False
+        size = self._max_batch_size or len(keys)
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(keys), size):
+            task = loop.create_task(self._run_batch(keys[start : start + size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, keys: List[Hashable]) -> None:
+        self.batches += 1
+        self.loaded += len(keys)
+        try:
+            results = list(await self._batch_fn(keys))
+            if len(results) != len(keys):
+                raise ValueError(f"Batch function returned {len(results)} results for {len(keys)} keys")
+        except asyncio.CancelledError:
+            for key in keys:
+                self._results.pop(key).cancel()
+            raise
+        except Exception as e:
+            for key in keys:
+                future = self._results.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+                    # 没有调用方等待时避免报告未获取的异常
+                    future.exception()
+            return
+        for key, result in zip(keys, results):
+            future = self._results[key]
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,248 @@
+"""
+股价技术指标
+
+基于 NumPy 的 SMA / EMA / RSI / VWAP 计算, 输入为按字段组织的价格数组(to_numpy_columns 的返回格式)。
+所有指标沿最后一个轴计算, 长度相同的多只股票堆叠为二维数组后一次完成计算。
+"""
+
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 支持的指标及默认周期, 指标名写作 "sma:20" / "ema:12" / "rsi:14" / "vwap"
+DEFAULT_PERIODS = {"sma": 20, "ema": 20, "rsi": 14, "vwap": 0}
+DEFAULT_INDICATORS = ("sma:20", "ema:20", "rsi:14", "vwap")
+
+# 指标结果缓存的默认条目上限
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def parse_indicator(indicator: str) -> Tuple[str, int]:
+    """
+    解析指标名
+
+    Args:
+        indicator: 指标名, 例如 "sma:20", "rsi", "vwap"
+
+    Returns:
+        Tuple[str, int]: (指标类型, 周期)
+    """
+    kind, _, period = indicator.strip().lower().partition(":")
+    if kind not in DEFAULT_PERIODS:
+        raise ValueError(f"Unsupported indicator: {indicator}, options: {', '.join(DEFAULT_PERIODS)}")
+    if kind == "vwap":
+        return kind, 0
+    period_value = int(period) if period else DEFAULT_PERIODS[kind]
+    if period_value < 1:
+        raise ValueError(f"Indicator period must be positive: {indicator}")
+    return kind, period_value
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    简单移动平均
+
+    前 window-1 个位置以及窗口内含 nan 的位置为 nan
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan)
+    length = values.shape[-1]
+    if window > length:
+        return result
+    missing = np.isnan(values)
+    # 前缀和相减得到窗口和, nan 单独计数, 计算量与窗口大小无关
+    zero_padding = np.zeros(values.shape[:-1] + (1,))
+    sums = np.concatenate([zero_padding, np.cumsum(np.where(missing, 0.0, values), axis=-1)], axis=-1)
+    nans = np.concatenate([zero_padding, np.cumsum(missing, axis=-1)], axis=-1)
+    window_sums = sums[..., window:] - sums[..., :-window]
+    window_nans = nans[..., window:] - nans[..., :-window]
+    result[..., window - 1 :] = np.where(window_nans > 0, np.nan, window_sums / window)
+    return result
+
+
+def _nanmean(values: np.ndarray) -> np.ndarray:
+    """沿最后一个轴求均值并忽略 nan, 全为 nan 时结果为 nan 且不发出警告"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return np.nanmean(values, axis=-1)
+
+
+def _ewm(values: np.ndarray, alpha: float, seed: np.ndarray, start: int) -> np.ndarray:
+    """
+    从 start 位置开始的指数加权递推, seed 为 start 位置的初始值, 遇到 nan 时沿用上一个值
+
+    递推只沿时间轴进行, 批量中的所有股票在每一步同时计算
+    """
+    result = np.full(values.shape, np.nan)
+    if start >= values.shape[-1]:
+        return result
+    current = seed.astype(np.float64)
+    result[..., start] = current
+    for index in range(start + 1, values.shape[-1]):
+        column = values[..., index]
+        current = np.where(np.isnan(column), current, current + alpha * (column - current))
+        result[..., index] = current
+    return result
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    指数移动平均, alpha = 2 / (span + 1), 以前 span 个值的简单平均作为初始值
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if span > values.shape[-1]:
+        return np.full(values.shape, np.nan)
+    seed = _nanmean(values[..., :span]) if span > 1 else values[..., 0]
+    return _ewm(values, 2.0 / (span + 1), seed, span - 1)
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    相对强弱指数(Wilder 平滑), 取值 0-100, 前 period 个位置为 nan
+    """
+    close = np.asarray(close, dtype=np.float64)
+    result = np.full(close.shape, np.nan)
+    if period >= close.shape[-1]:
+        return result
+    change = np.diff(close, axis=-1)
+    gain = np.where(change > 0, change, np.where(np.isnan(change), np.nan, 0.0))
+    loss = np.where(change < 0, -change, np.where(np.isnan(change), np.nan, 0.0))
+    average_gain = _ewm(gain, 1.0 / period, _nanmean(gain[..., :period]), period - 1)
+    average_loss = _ewm(loss, 1.0 / period, _nanmean(loss[..., :period]), period - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strength = 100.0 - 100.0 / (1.0 + average_gain / average_loss)
+    # 没有下跌时 RSI 为 100
+    strength = np.where((average_loss == 0) & (average_gain > 0), 100.0, strength)
+    result[..., 1:] = strength
+    return result
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, session: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    成交量加权平均价, 典型价格为 (high + low + close) / 3
+
+    Args:
+        session: 与价格形状相同的交易日数组(例如 datetime64[D] 的 date 字段), 提供时每个交易日重新累计,
+            不提供时从序列开头累计
+    """
+    typical = (np.asarray(high, dtype=np.float64) + np.asarray(low, dtype=np.float64) + np.asarray(close, dtype=np.float64)) / 3.0
+    volume = np.asarray(volume, dtype=np.float64)
+    valid = ~(np.isnan(typical) | np.isnan(volume))
+    cumulative_value = np.cumsum(np.where(valid, typical * volume, 0.0), axis=-1)
+    cumulative_volume = np.cumsum(np.where(valid, volume, 0.0), axis=-1)
+
+    if session is not None and typical.shape[-1] > 1:
+        # 每个位置所在交易日第一根K线的下标, 减去该位置之前的累计值即得到当日累计值
+        session = np.asarray(session)
+        positions = np.broadcast_to(np.arange(typical.shape[-1]), typical.shape)
+        boundary = np.concatenate([np.ones(typical.shape[:-1] + (1,), dtype=bool), session[..., 1:] != session[..., :-1]], axis=-1)
+        session_start = np.maximum.accumulate(np.where(boundary, positions, 0), axis=-1)
+        before_value = np.concatenate([np.zeros(typical.shape[:-1] + (1,)), cumulative_value[..., :-1]], axis=-1)
+        before_volume = np.concatenate([np.zeros(typical.shape[:-1] + (1,)), cumulative_volume[..., :-1]], axis=-1)
+        cumulative_value = cumulative_value - np.take_along_axis(before_value, session_start, axis=-1)
+        cumulative_volume = cumulative_volume - np.take_along_axis(before_volume, session_start, axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(cumulative_volume > 0, cumulative_value / cumulative_volume, np.nan)
+
+
+def _compute(kind: str, period: int, columns: Dict[str, np.ndarray], session: Optional[np.ndarray]) -> np.ndarray:
+    if kind == "sma":
+        return sma(columns["close"], period)
+    if kind == "ema":
+        return ema(columns["close"], period)
+    if kind == "rsi":
+        return rsi(columns["close"], period)
+    return vwap(columns["high"], columns["low"], columns["close"], columns["volume"], session)
+
+
+def compute_indicators(
+    prices: Dict[Hashable, Dict[str, Any]], indicators: Sequence[str] = DEFAULT_INDICATORS, session_vwap: bool = False
+) -> Dict[Hashable, Dict[str, np.ndarray]]:
+    """
+    批量计算多只股票的多个指标
+
+    长度相同的序列堆叠为二维数组, 每个指标在每组上只计算一次
+
+    Args:
+        prices: {键: 按字段组织的价格数组}, 至少包含 high/low/close/volume, session_vwap 时还需要 date
+        indicators: 指标名列表, 例如 ["sma:20", "ema:12", "rsi:14", "vwap"]
+        session_vwap: VWAP 是否按交易日重新累计(适用于分钟级K线)
+
+    Returns:
+        Dict[Hashable, Dict[str, np.ndarray]]: {键: {指标名: 与价格等长的 float64 数组}}
+    """
+    parsed = [(indicator, parse_indicator(indicator)) for indicator in indicators]
+    groups: Dict[int, List[Hashable]] = {}
+    for key, columns in prices.items():
+        groups.setdefault(len(columns["close"]), []).append(key)
+
+    results: Dict[Hashable, Dict[str, np.ndarray]] = {key: {} for key in prices}
+    for keys in groups.values():
+        stacked = {
+            field: np.vstack([np.asarray(prices[key][field], dtype=np.float64) for key in keys])
+            for field in ("high", "low", "close", "volume")
+        }
+        session = np.vstack([np.asarray(prices[key]["date"]) for key in keys]) if session_vwap else None
+        for indicator, (kind, period) in parsed:
+            values = _compute(kind, period, stacked, session)
+            for row, key in enumerate(keys):
+                results[key][indicator] = values[row]
+    return results
+
+
+def to_list(values: np.ndarray) -> List[Optional[float]]:
+    """转换为 Python 列表, nan 转为 None 以便序列化为 JSON"""
+    return [None if value != value else value for value in np.asarray(values, dtype=np.float64).tolist()]
+
+
+class IndicatorCache:
+    """
+    指标结果缓存
+
+    结果按 (序列键, 指标名) 保存, 并记录计算时价格序列的版本号, 序列更新后版本号变化, 旧结果自动失效
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Tuple[Hashable, str], Tuple[Hashable, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, indicator: str, version: Hashable) -> Optional[np.ndarray]:
+        """获取指定版本的指标结果, 不存在或版本不一致时返回 None"""
+        with self._lock:
+            item = self._data.get((key, indicator))
+            if item is not None and item[0] == version:
+                self._data.move_to_end((key, indicator))
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, indicator: str, version: Hashable, values: np.ndarray) -> None:
+        """写入指标结果, 数组被标记为只读, 防止缓存内容被原地修改"""
+        values.setflags(write=False)
+        with self._lock:
+            self._data[(key, indicator)] = (version, values)
+            self._data.move_to_end((key, indicator))
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取缓存统计
+
+        Returns:
+            Dict[str, int]: 包含 size, hits, misses
+        """
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,332 @@
+"""
+数据源能力与描述清单
+
+get_capabilities 和 ApiClient 的描述文本需要反射方法并解析文档字符串, 结果只取决于源码。
+清单按 "模块名:类名" 保存这些结果以及生成时源码的哈希, 源码未变化时直接使用清单中的结果,
+源码变化后该条目失效, 在进程内重新计算一次并缓存。
+
+构建清单文件:
+    python -m external_api.data_sources.manifest
+"""
+
+import copy
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .base import EXCLUDE_METHODS
+
+logger = logging.getLogger("data_sources_manifest")
+
+# 清单文件格式版本, 格式或渲染方式变化时递增, 旧版本清单整体失效
+MANIFEST_VERSION = 1
+MANIFEST_FILE_NAME = "api_manifest.json"
+DEFAULT_MANIFEST_PATH = Path(__file__).parent / MANIFEST_FILE_NAME
+
+# 除数据源模块本身外, 影响能力与描述结果的源文件
+_SHARED_SOURCE_FILES = ("base.py", "manifest.py")
+
+_file_hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_file_hashes_lock = threading.Lock()
+
+
+def file_hash(path: str) -> str:
+    """
+    计算文件内容的 sha256, 文件的修改时间与大小不变时复用上次的结果
+    """
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _file_hashes_lock:
+        cached = _file_hashes.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    with _file_hashes_lock:
+        _file_hashes[path] = (signature, digest)
+    return digest
+
+
+def source_hash(module_name: str) -> Optional[str]:
+    """
+    计算数据源模块及共享源文件的组合哈希
+
+    Args:
+        module_name: data_sources 下的模块名, 例如 yahoo_source
+
+    Returns:
+        Optional[str]: 哈希值, 模块文件不存在时返回 None
+    """
+    directory = Path(__file__).parent
+    digest = hashlib.sha256()
+    try:
+        for file_name in (f"{module_name}.py",) + _SHARED_SOURCE_FILES:
+            digest.update(file_hash(str(directory / file_name)).encode())
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def build_capabilities(cls: type) -> List[Dict[str, Any]]:
+    """
+    获取数据源类所有能力的描述
+    通过扫描公开方法及其文档字符串自动获取能力描述
+
+    Returns:
+        List[Dict[str, Any]]: 数据源提供的所有方法的描述列表
+    """
+    # 获取所有公开方法（不包括内置方法和私有方法）
+    capabilities = []
+    for attr_name in dir(cls):
+        if not attr_name.startswith("_"):  # 排除私有方法
+            attr = getattr(cls, attr_name)
+            if callable(attr) and attr_name not in EXCLUDE_METHODS:
+                # 获取方法的文档字符串
+                doc = inspect.getdoc(attr)
+                if not doc:  # 跳过没有文档的方法
+                    continue
+                if "raise NotImplementedError" in inspect.getsource(attr):  # 跳过未实现的方法
+                    continue
+                # 获取方法的签名
+                sig = inspect.signature(attr)
+                # 构建能力描述
+                capability = {
+                    "name": attr_name,
+                    "description": doc.split("\n\n")[0] if doc else "",  # 取第一段作为简短描述
+                    "parameters": {
+                        name: str(param.annotation).replace("typing.", "") for name, param in sig.parameters.items() if name != "self"
+                    },
+                    "return_type": str(sig.return_annotation).replace("typing.", ""),
+                    "doc": doc,  # 完整的文档字符串
+                }
+                capabilities.append(capability)
+    return capabilities
+
+
+def render_desc(api_name: str, api_info: Dict[str, Any], cls: type) -> str:
+    """
+    生成数据源的可读描述及调用示例
+
+    Args:
+        api_name: 数据源名称
+        api_info: 数据源 get_api_info 的返回值
+        cls: 数据源类
+
+    Returns:
+        str: Markdown 格式的描述
+    """
+    from docstring_parser import parse
+
+    output_lines = ["# Available data sources (refer to the python code examples, write python code to call them)\n"]
+
+    # Add data source title and description
+    display_name = api_info.get("name", api_name)
+    source_desc = api_info.get("description", "No description available")
+    output_lines.extend([f"## {display_name}", f"{source_desc}\n"])
+
+    # Get data source methods
+    apis = []
+    for method_name, method in inspect.getmembers(cls, predicate=inspect.isfunction):
+        # Skip internal methods
+        if method_name.startswith("_") or method_name in EXCLUDE_METHODS:
+            continue
+
+        # Get method docstring
+        doc = inspect.getdoc(method)
+        if not doc:
+            continue
+
+        # Parse docstring
+        docstring = parse(doc)
+
+        # Prepare method description
+        method_lines = [f"### {method_name}"]
+        if docstring.short_description:
+            method_lines.append(docstring.short_description + "\n")
+
+        # Add parameter description
+        if docstring.params:
+            method_lines.append("**Parameters:**")
+            for param in docstring.params:
+                param_desc = f"- `{param.arg_name}`"
+                if param.type_name:
+                    param_desc += f": {param.type_name}"
+                if param.description:
+                    param_desc += f" - {param.description}"
+                method_lines.append(param_desc)
+            method_lines.append("")
+
+        # Add return value description
+        if docstring.returns:
+            method_lines.append("**Returns:**")
+            if docstring.returns.type_name:
+                method_lines.append(f"Type: `{docstring.returns.type_name}`")
+            if docstring.returns.description:
+                method_lines.append("```")
+                method_lines.append(docstring.returns.description)
+                method_lines.append("```")
+            method_lines.append("")
+
+        # Add example
+        if docstring.examples:
+            method_lines.append("**Example:**")
+            method_lines.append("```python")
+            for example in docstring.examples:
+                if example.description:
+                    # Directly add example code, no processing
+                    method_lines.append(example.description.strip())
+            method_lines.append("```")
+            method_lines.append("")
+
+        apis.extend(method_lines)
+
+    # Merge all method descriptions
+    if apis:
+        output_lines.extend(apis)
+    output_lines.append("---\n")
+
+    return "\n".join(output_lines)
+
+
+class ApiManifest:
+    """
+    能力与描述清单
+
+    清单文件在首次查询时读取一次; 条目的源码哈希与当前源码不一致时视为失效,
+    失效或缺失的条目在进程内重新计算后缓存, 不会写回清单文件
+    """
+
+    def __init__(self, path: Path = DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            entries = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    entries = data.get("entries", {})
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"读取数据源清单 {self.path} 失败: {str(e)}")
+            self._entries = entries
+        return self._entries
+
+    def _entry(self, module_name: str, class_name: str) -> Dict[str, Any]:
+        """获取与当前源码一致的条目, 不一致时替换为空条目"""
+        key = f"{module_name}:{class_name}"
+        current_hash = source_hash(module_name)
+        entries = self._load()
+        entry = entries.get(key)
+        if entry is None or current_hash is None or entry.get("hash") != current_hash:
+            entry = {"hash": current_hash}
+            entries[key] = entry
+        return entry
+
+    def get_capabilities(self, cls: type) -> List[Dict[str, Any]]:
+        """
+        获取数据源类的能力描述, 结果与 build_capabilities 相同
+
+        Returns:
+            List[Dict[str, Any]]: 能力描述列表, 调用方可以修改
+        """
+        module_name = cls.__module__.rsplit(".", 1)[-1]
+        with self._lock:
+            entry = self._entry(module_name, cls.__name__)
+            if "capabilities" not in entry:
+                entry["capabilities"] = build_capabilities(cls)
+            return copy.deepcopy(entry["capabilities"])
+
+    def get_desc(self, module_name: str, class_name: str, api_name: str, api_factory: Callable[[], Any]) -> Optional[str]:
+        """
+        获取数据源的描述文本, 结果与 render_desc 相同
+
+        Args:
+            module_name: 数据源模块名
+            class_name: 数据源类名
+            api_name: 数据源名称
+            api_factory: 清单中没有可用结果时调用, 返回数据源实例, 实例不可用时返回 None
+
+        Returns:
+            Optional[str]: 描述文本, 数据源不可用时返回 None
+        """
+        with self._lock:
+            entry = self._entry(module_name, class_name)
+            if "desc" not in entry:
+                api = api_factory()
+                if api is None:
+                    return None
+                entry["desc"] = render_desc(api_name, api.get_api_info(), type(api))
+            return entry["desc"]
+
+    def save(self) -> None:
+        """将当前条目写入清单文件"""
+        with self._lock:
+            data = {"version": MANIFEST_VERSION, "entries": dict(sorted(self._load().items()))}
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.write("\n")
+            os.replace(tmp_path, self.path)
+
+
+# 全局默认实例
+_default_manifest: Optional[ApiManifest] = None
+_manifest_lock = threading.Lock()
+
+
+def get_api_manifest() -> ApiManifest:
+    """
+    Get the default ApiManifest instance
+
+    Returns:
+        ApiManifest: Default ApiManifest instance
+    """
+    global _default_manifest
+    if _default_manifest is None:
+        with _manifest_lock:
+            if _default_manifest is None:  # Double-check
+                _default_manifest = ApiManifest()
+    return _default_manifest
+
+
+def build_manifest(path: Path = DEFAULT_MANIFEST_PATH) -> ApiManifest:
+    """
+    加载所有数据源, 重新生成全部条目并写入清单文件
+
+    Args:
+        path: 清单文件路径
+
+    Returns:
+        ApiManifest: 新生成的清单
+    """
+    from .client import ApiType, get_client
+
+    client = get_client()
+    manifest = ApiManifest(path)
+    manifest._entries = {}
+    for api_type in ApiType:
+        for api_name in client._get_api_names(api_type):
+            api = client._get_api(api_type, api_name)
+            if api is None:
+                continue
+            module_name, class_name = client._manifest[api_type][api_name]
+            manifest.get_capabilities(type(api))
+            manifest.get_desc(module_name, class_name, api_name, lambda: api)
+    manifest.save()
+    return manifest
+
+
+if __name__ == "__main__":
+    built = build_manifest()
+    print(f"Wrote {len(built._load())} entries to {built.path}", file=sys.stderr)
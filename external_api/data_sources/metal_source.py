@@ -8,9 +8,9 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-import aiohttp
-
 from .base import BaseAPI
+from .singleflight import coalesced
+from .transport import TransportError
 
 logger = logging.getLogger("metal_source")
 
@@ -46,6 +46,7 @@ class MetalSource(BaseAPI):
             "description": "Metal price data source, provides price information for metals such as Gold, Silver, Platinum, Palladium, Rhodium.",
         }
 
+    @coalesced
     async def get_metal_price(
         self,
         currency_code: str,
@@ -91,16 +92,12 @@ class MetalSource(BaseAPI):
             # Build query parameters
             params = {"currency": currency_code}
 
-            payload = {}
+            payload: Dict[str, Any] = {}
 
             request_url = f"{self.proxy_url}/web-crawling/api/gold-index"
 
-            # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(request_url, headers=self._headers, params=params, json=payload, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # Parse the response
-                    data = await response.json(content_type=None)
+            # Send request
+            data = await self._request_json("POST", request_url, headers=self._headers, params=params, json=payload, timeout=self._timeout)
 
             if isinstance(data, str):
                 data = json.loads(data)
@@ -134,7 +131,7 @@ class MetalSource(BaseAPI):
             error_msg = f"Request timeout (timeout={self._timeout}s)"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             error_msg = f"HTTP request error: {str(e)}"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
@@ -8,9 +8,8 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-import aiohttp
-
 from .base import BaseAPI
+from .transport import TransportError
 
 logger = logging.getLogger("pinterest_source")
 
@@ -117,12 +116,8 @@ class PinterestSource(BaseAPI):
 
             request_url = f"{self.proxy_url}/pinterest/pins/advance"
 
-            # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(request_url, headers=self._headers, json=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # Parse the response
-                    data = await response.json(content_type=None)
+            # Send request
+            data = await self._request_json("POST", request_url, headers=self._headers, json=params, timeout=self._timeout)
 
             # The API returns a JSON string, need to parse it first
             if isinstance(data, str):
@@ -142,7 +137,7 @@ class PinterestSource(BaseAPI):
             error_msg = f"Request timeout (timeout={self._timeout}s)"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             error_msg = f"HTTP request error: {str(e)}"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
@@ -194,12 +189,8 @@ class PinterestSource(BaseAPI):
             # Set request parameters
             params = {"keyword": username}
 
-            # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self._headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # Parse the response
-                    data = await response.json(content_type=None)
+            # Send request
+            data = await self._request_json("GET", request_url, headers=self._headers, params=params, timeout=self._timeout)
 
             # Parse response data
             if isinstance(data, str):
@@ -215,7 +206,7 @@ class PinterestSource(BaseAPI):
             error_msg = f"Request timeout (timeout={self._timeout}s)"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             error_msg = f"HTTP request error: {str(e)}"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
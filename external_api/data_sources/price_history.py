@@ -0,0 +1,358 @@
+"""
+股价K线本地缓存
+
+按 (股票代码, 时间间隔) 保存已下载的K线以及已覆盖的时间范围,
+再次查询重叠区间时只需请求缺失的子区间
+"""
+
+import bisect
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# 各时间间隔对应的秒数, 用于判断最近的K线是否已经收盘
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "2m": 120,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "60m": 3600,
+    "90m": 5400,
+    "1h": 3600,
+    "1d": 86400,
+    "5d": 5 * 86400,
+    "1wk": 7 * 86400,
+    "1mo": 31 * 86400,
+    "3mo": 92 * 86400,
+}
+
+# 分钟级K线单次请求的最大时间跨度(秒), 上游对单次返回的分钟级数据量有限制,
+# 超出时可能超时或被截断, 长区间按该跨度切片后分别请求
+MAX_CHART_RANGE_SECONDS = {
+    "1m": 5 * 86400,
+    "2m": 30 * 86400,
+    "5m": 30 * 86400,
+    "15m": 30 * 86400,
+    "30m": 30 * 86400,
+    "60m": 180 * 86400,
+    "90m": 180 * 86400,
+    "1h": 180 * 86400,
+}
+
+# 最多缓存的 (股票代码, 时间间隔) 序列数, 超出后淘汰最久未使用的序列
+DEFAULT_MAX_SERIES = 512
+
+# 序列首次写入后的最长保留时间(秒), 超过后整个序列重新下载。
+# 拆股、分红等复权调整会改写历史K线, 只下载缺失区间会把新旧复权口径的K线混在一起
+DEFAULT_MAX_AGE = 12 * 3600
+
+# (open, high, low, close, volume)
+Bar = Tuple[Optional[float], Optional[float], Optional[float], Optional[float], Optional[float]]
+
+# get_stock_price 支持的返回格式
+PRICE_FORMAT_RECORDS = "records"
+PRICE_FORMAT_COLUMNS = "columns"
+PRICE_FORMAT_NUMPY = "numpy"
+PRICE_FORMATS = (PRICE_FORMAT_RECORDS, PRICE_FORMAT_COLUMNS, PRICE_FORMAT_NUMPY)
+
+# 序列版本号在所有序列间全局递增, 序列被淘汰后重建也不会与旧版本号重复
+_versions = itertools.count(1)
+
+
+def split_range(start: int, end: int, interval: str) -> List[Tuple[int, int]]:
+    """
+    将 [start, end) 按时间间隔对应的最大跨度切分为连续的子区间
+
+    切分点对齐到K线间隔, 日线及以上的间隔不切分
+
+    Returns:
+        List[Tuple[int, int]]: 子区间列表, 按时间升序
+    """
+    max_range = MAX_CHART_RANGE_SECONDS.get(interval)
+    if not max_range or end - start <= max_range:
+        return [(start, end)]
+    step = INTERVAL_SECONDS[interval]
+    slices = []
+    cursor = start
+    while cursor < end:
+        slice_end = min((cursor + max_range) // step * step, end)
+        if slice_end <= cursor:
+            slice_end = min(cursor + max_range, end)
+        slices.append((cursor, slice_end))
+        cursor = slice_end
+    return slices
+
+
+class PriceSeries:
+    """
+    单个 (股票代码, 时间间隔) 的K线序列
+
+    bars 以时间戳为键, covered 为已确认完整下载的 [start, end) 区间列表(有序且互不重叠)。
+    version 在每次写入后更新为新的全局唯一值, 供基于序列的计算结果做失效判断。
+    filled_at 为首次写入的时间(time.monotonic), 用于判断序列是否超过最长保留时间。
+    """
+
+    def __init__(self):
+        self.bars: Dict[int, Bar] = {}
+        self.covered: List[Tuple[int, int]] = []
+        self.version = next(_versions)
+        self.filled_at: Optional[float] = None
+        self._timestamps: List[int] = []
+
+    def missing_ranges(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        计算 [start, end) 中尚未覆盖的子区间
+
+        Returns:
+            List[Tuple[int, int]]: 缺失的 [start, end) 区间列表
+        """
+        gaps = []
+        cursor = start
+        for covered_start, covered_end in self.covered:
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def add(self, start: int, end: int, timestamps: Sequence[int], bars: Sequence[Bar], covered_until: int) -> None:
+        """
+        写入 [start, end) 区间的下载结果
+
+        Args:
+            start: 请求的开始时间戳
+            end: 请求的结束时间戳
+            timestamps: K线时间戳列表
+            bars: 与 timestamps 一一对应的K线
+            covered_until: 该时间之后的K线可能尚未收盘, 覆盖范围不超过该时间, 下次查询会重新获取
+
+        已覆盖区间内的K线与新下载的值不一致时, 说明上游的复权口径已变化, 丢弃已有的覆盖范围,
+        之后的查询重新下载整个区间并覆盖旧K线。已有K线仍保留, 避免本次查询只返回部分区间
+        """
+        if self._is_restated(timestamps, bars):
+            self.covered = []
+            self.filled_at = None
+        if self.filled_at is None:
+            self.filled_at = time.monotonic()
+        new_timestamps = sorted(timestamp for timestamp in set(timestamps) if timestamp not in self.bars)
+        self.bars.update(zip(timestamps, bars))
+        if new_timestamps:
+            if not self._timestamps or new_timestamps[0] > self._timestamps[-1]:
+                self._timestamps.extend(new_timestamps)
+            else:
+                self._timestamps = sorted(self._timestamps + new_timestamps)
+        end = min(end, covered_until)
+        if start < end:
+            self._mark_covered(start, end)
+        self.version = next(_versions)
+
+    def _is_restated(self, timestamps: Sequence[int], bars: Sequence[Bar]) -> bool:
+        # 未收盘的K线不在覆盖范围内, 其值变化属于正常更新
+        for timestamp, bar in zip(timestamps, bars):
+            old_bar = self.bars.get(timestamp)
+            if old_bar is not None and old_bar != bar and self._is_covered(timestamp):
+                return True
+        return False
+
+    def _is_covered(self, timestamp: int) -> bool:
+        index = bisect.bisect_right(self.covered, timestamp, key=lambda item: item[0]) - 1
+        return index >= 0 and timestamp < self.covered[index][1]
+
+    def _mark_covered(self, start: int, end: int) -> None:
+        merged = []
+        for covered_start, covered_end in self.covered:
+            if covered_end < start or covered_start > end:
+                merged.append((covered_start, covered_end))
+            else:
+                start = min(start, covered_start)
+                end = max(end, covered_end)
+        merged.append((start, end))
+        merged.sort()
+        self.covered = merged
+
+    def get(self, start: int, end: int) -> Tuple[List[int], List[Bar]]:
+        """
+        获取 [start, end) 区间内的K线, 按时间升序
+
+        Returns:
+            Tuple[List[int], List[Bar]]: 时间戳列表与K线列表
+        """
+        lo = bisect.bisect_left(self._timestamps, start)
+        hi = bisect.bisect_left(self._timestamps, end)
+        timestamps = self._timestamps[lo:hi]
+        return timestamps, [self.bars[timestamp] for timestamp in timestamps]
+
+
+class PriceHistoryStore:
+    """
+    K线序列存储, 按 (股票代码, 时间间隔) 管理 PriceSeries, 序列数量有上限
+
+    序列首次写入超过 max_age 秒后, 下一次查询缺失区间时整个序列被丢弃并重新下载
+    """
+
+    def __init__(self, max_series: int = DEFAULT_MAX_SERIES, max_age: float = DEFAULT_MAX_AGE):
+        self.max_series = max_series
+        self.max_age = max_age
+        self._series: "OrderedDict[Tuple[str, str], PriceSeries]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def series(self, symbol: str, interval: str) -> PriceSeries:
+        """
+        获取序列, 不存在时创建
+
+        Returns:
+            PriceSeries: K线序列
+        """
+        key = (symbol.upper(), interval)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = PriceSeries()
+                self._series[key] = series
+                while len(self._series) > self.max_series:
+                    self._series.popitem(last=False)
+            else:
+                self._series.move_to_end(key)
+            return series
+
+    def missing_ranges(self, symbol: str, interval: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        计算 [start, end) 中需要从上游获取的子区间
+
+        只在这里判断序列是否过期: 一次查询在此之后写入和读取的是同一个序列
+        """
+        with self._lock:
+            series = self.series(symbol, interval)
+            if series.filled_at is not None and time.monotonic() - series.filled_at > self.max_age:
+                series = PriceSeries()
+                self._series[(symbol.upper(), interval)] = series
+            return series.missing_ranges(start, end)
+
+    def add(self, symbol: str, interval: str, start: int, end: int, timestamps: Sequence[int], bars: Sequence[Bar]) -> None:
+        """
+        写入 [start, end) 区间的下载结果
+
+        覆盖范围不超过可能尚未收盘的最新K线, 也不超过返回的最后一根K线之后一个间隔:
+        延迟发布的数据源尚未返回的近期K线在下次查询时重新获取。分钟级请求没有返回任何K线时不记录覆盖范围
+        """
+        interval_seconds = INTERVAL_SECONDS.get(interval, 86400)
+        covered_until = int(time.time()) - interval_seconds
+        if timestamps:
+            covered_until = min(covered_until, max(timestamps) + interval_seconds)
+        elif interval in MAX_CHART_RANGE_SECONDS:
+            covered_until = start
+        with self._lock:
+            self.series(symbol, interval).add(start, end, timestamps, bars, covered_until)
+
+    def get(self, symbol: str, interval: str, start: int, end: int) -> Tuple[List[int], List[Bar]]:
+        """获取 [start, end) 区间内已缓存的K线"""
+        with self._lock:
+            return self.series(symbol, interval).get(start, end)
+
+    def version(self, symbol: str, interval: str) -> int:
+        """获取序列当前的版本号"""
+        with self._lock:
+            return self.series(symbol, interval).version
+
+    def clear(self) -> None:
+        """清空所有序列"""
+        with self._lock:
+            self._series.clear()
+
+
+# 时区偏移只在整 15 分钟的 UTC 时刻发生变化, 同一个 15 分钟区间内的时间戳共用一个偏移
+_OFFSET_BUCKET_SECONDS = 900
+
+
+def format_dates(timestamps: Sequence[int]) -> List[str]:
+    """
+    按本地时区将时间戳格式化为 YYYY-MM-DD
+
+    时区偏移每 15 分钟只计算一次, 日期字符串每个本地日只格式化一次, 分钟级K线可省去绝大部分 strftime 调用
+    """
+    offsets_by_bucket: Dict[int, int] = {}
+    dates_by_day: Dict[int, str] = {}
+    dates = []
+    for timestamp in timestamps:
+        bucket = timestamp // _OFFSET_BUCKET_SECONDS
+        offset = offsets_by_bucket.get(bucket)
+        if offset is None:
+            offset = offsets_by_bucket[bucket] = time.localtime(timestamp).tm_gmtoff
+        day = (timestamp + offset) // 86400
+        date = dates_by_day.get(day)
+        if date is None:
+            date = dates_by_day[day] = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
+        dates.append(date)
+    return dates
+
+
+def _to_int(value: Optional[float]) -> Optional[int]:
+    """成交量转换为整数, 缺失值保留为 None"""
+    return None if value is None else int(value)
+
+
+def to_records(timestamps: Sequence[int], bars: Sequence[Bar]) -> List[Dict[str, Any]]:
+    """
+    转换为按K线组织的字典列表(默认返回格式)
+    """
+    return [
+        {"date": date, "open": open_price, "high": high, "low": low, "close": close, "volume": _to_int(volume)}
+        for date, (open_price, high, low, close, volume) in zip(format_dates(timestamps), bars)
+    ]
+
+
+def to_columns(timestamps: Sequence[int], bars: Sequence[Bar]) -> Dict[str, List[Any]]:
+    """
+    转换为按字段组织的并列列表
+    """
+    opens, highs, lows, closes, volumes = (list(column) for column in zip(*bars)) if bars else ([], [], [], [], [])
+    return {
+        "date": format_dates(timestamps),
+        "timestamp": list(timestamps),
+        "open": opens,
+        "high": highs,
+        "low": lows,
+        "close": closes,
+        "volume": [_to_int(volume) for volume in volumes],
+    }
+
+
+def to_numpy_columns(timestamps: Sequence[int], bars: Sequence[Bar]) -> Dict[str, Any]:
+    """
+    转换为按字段组织的 NumPy 数组
+
+    date 为本地时区的 datetime64[D] 数组, 价格为 float64(缺失值为 nan),
+    volume 没有缺失值时为 int64, 否则为 float64
+    """
+    import numpy as np
+
+    timestamp_array = np.asarray(timestamps, dtype=np.int64)
+    # 每 15 分钟只计算一次本地时区偏移, 其余转换全部向量化
+    buckets, bucket_index = np.unique(timestamp_array // _OFFSET_BUCKET_SECONDS, return_inverse=True)
+    offsets = np.array([time.localtime(int(bucket) * _OFFSET_BUCKET_SECONDS).tm_gmtoff for bucket in buckets], dtype=np.int64)
+    local_times = (timestamp_array + offsets[bucket_index.reshape(-1)]).astype("datetime64[s]")
+
+    values = np.array(bars, dtype=np.float64).reshape(-1, 5)
+    volume = values[:, 4]
+    if not np.isnan(volume).any():
+        volume = volume.astype(np.int64)
+    return {
+        "date": local_times.astype("datetime64[D]"),
+        "timestamp": timestamp_array,
+        "open": values[:, 0],
+        "high": values[:, 1],
+        "low": values[:, 2],
+        "close": values[:, 3],
+        "volume": volume,
+    }
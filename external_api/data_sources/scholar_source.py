@@ -7,9 +7,8 @@ import logging
 import math
 from typing import Any, Dict, Optional
 
-import aiohttp
-
 from .base import BaseAPI
+from .transport import TransportError
 
 logger = logging.getLogger("scholar_source")
 
@@ -79,10 +78,7 @@ class ScholarSource(BaseAPI):
         request_url = f"{self.proxy_url}/scholar"
 
         try:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(request_url, headers=self.headers, json=payload, timeout=self.timeout) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+            data = await self._request_json("POST", request_url, headers=self.headers, json=payload, timeout=self.timeout)
 
             organic = data.get("organic", [])
 
@@ -104,7 +100,7 @@ class ScholarSource(BaseAPI):
             error_msg = f"Request timeout (timeout={self.timeout}s)"
             logger.error(f"_fetch_scholar_page error: page={page}, {error_msg}")
             return {"success": False, "error": error_msg}
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             logger.error(f"_fetch_scholar_page error: page={page}, error={e}")
             return {"success": False, "error": str(e)}
         except Exception as e:
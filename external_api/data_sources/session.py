@@ -0,0 +1,132 @@
+"""
+数据源共享HTTP会话管理
+
+所有数据源通过 SessionManager 复用同一组连接池, 避免每次请求都重新建立 TCP/TLS 连接
+"""
+
+import asyncio
+import logging
+import threading
+import warnings
+from typing import Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger("data_sources_session")
+
+# 连接池总连接数上限
+DEFAULT_LIMIT = 100
+# 单个 host 的连接数上限, 所有数据源都经由同一个 external-api 代理, 这里是实际生效的上限
+DEFAULT_LIMIT_PER_HOST = 32
+# 空闲连接保活时间(秒)
+DEFAULT_KEEPALIVE_TIMEOUT = 30
+# DNS 解析结果缓存时间(秒)
+DEFAULT_DNS_CACHE_TTL = 300
+
+
+class SessionManager:
+    """
+    aiohttp 会话管理器
+
+    aiohttp.ClientSession 绑定在创建它的事件循环上, 因此按事件循环各持有一个会话。
+    同一事件循环内的所有数据源共享该会话的连接池(按 host 限流、keep-alive、DNS 缓存)。
+    指定 unix_socket_path 时所有请求经由该 Unix 域套接字发送, URL 中的 host 仅用于 Host 头。
+    """
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_LIMIT,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache: int = DEFAULT_DNS_CACHE_TTL,
+        unix_socket_path: Optional[str] = None,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.unix_socket_path = unix_socket_path
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._lock = threading.Lock()
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        获取当前事件循环对应的共享会话, 不存在或已关闭时创建新会话
+
+        Returns:
+            aiohttp.ClientSession: 共享会话
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                self._prune_closed_loops()
+                connector: aiohttp.BaseConnector
+                if self.unix_socket_path:
+                    connector = aiohttp.UnixConnector(
+                        path=self.unix_socket_path,
+                        limit=self.limit,
+                        limit_per_host=self.limit_per_host,
+                        keepalive_timeout=self.keepalive_timeout,
+                    )
+                else:
+                    connector = aiohttp.TCPConnector(
+                        limit=self.limit,
+                        limit_per_host=self.limit_per_host,
+                        keepalive_timeout=self.keepalive_timeout,
+                        use_dns_cache=True,
+                        ttl_dns_cache=self.ttl_dns_cache,
+                    )
+                # Unix 域套接字直连本机服务, 不使用环境变量中的代理
+                session = aiohttp.ClientSession(connector=connector, trust_env=not self.unix_socket_path)
+                self._sessions[loop] = session
+            return session
+
+    def _prune_closed_loops(self) -> None:
+        """清理已关闭事件循环上遗留的会话"""
+        for loop in [loop for loop in self._sessions if loop.is_closed()]:
+            _discard_session(self._sessions.pop(loop))
+
+    async def close(self) -> None:
+        """关闭当前事件循环上的会话"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def shutdown(self) -> None:
+        """
+        关闭所有事件循环上的会话, 用于进程退出时的清理
+        """
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for loop, session in sessions.items():
+            if session.closed:
+                continue
+            if loop.is_closed():
+                _discard_session(session)
+                continue
+            try:
+                if loop.is_running():
+                    asyncio.run_coroutine_threadsafe(session.close(), loop)
+                else:
+                    loop.run_until_complete(session.close())
+            except Exception as e:
+                logger.warning(f"关闭共享会话失败: {str(e)}")
+
+
+def _discard_session(session: aiohttp.ClientSession) -> None:
+    """
+    释放已关闭事件循环上的会话
+
+    事件循环关闭后(例如 asyncio.run 返回后)无法再 await session.close(),
+    这里分离并同步关闭连接器, 避免进程退出时报告未关闭的会话
+    """
+    connector = session.connector
+    session.detach()
+    if connector is not None:
+        with warnings.catch_warnings():
+            # aiohttp 3.x 中 close() 同步完成, 返回值仅用于兼容 await 写法
+            warnings.simplefilter("ignore", DeprecationWarning)
+            connector.close()
@@ -0,0 +1,94 @@
+"""
+相同请求合并(single-flight)
+
+并发发起的相同调用只向上游发送一次请求, 所有调用方共享同一个结果
+"""
+
+import asyncio
+import copy
+import functools
+from typing import Any, Callable, Coroutine, Dict, Hashable, Tuple
+
+from .cache import make_call_key
+
+
+class _Flight:
+    """一次正在进行的上游调用"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 1
+
+
+class SingleFlight:
+    """
+    按键合并并发调用
+
+    同一事件循环上键相同的调用在第一个调用完成前加入同一个任务, 完成后即从表中移除,
+    之后的调用会重新发起请求。任务被 shield 保护, 单个调用方取消不会影响其他调用方。
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.shared = 0
+        self._flights: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], _Flight] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Coroutine[Any, Any, Any]]) -> Tuple[Any, bool]:
+        """
+        执行调用, 已有相同键的调用在进行中时等待其结果
+
+        Args:
+            key: 调用键
+            func: 无参数的协程工厂函数, 仅在需要发起新调用时执行
+
+        Returns:
+            Tuple[Any, bool]: 调用结果, 以及该结果是否被多个调用方共享
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        flight = self._flights.get(flight_key)
+        if flight is None or flight.task.done():
+            flight = _Flight(loop.create_task(func()))
+            self._flights[flight_key] = flight
+            flight.task.add_done_callback(functools.partial(self._finish, flight_key, flight))
+            self.executed += 1
+        else:
+            flight.waiters += 1
+            self.shared += 1
+
+        result = await asyncio.shield(flight.task)
+        return result, flight.waiters > 1
+
+    def _finish(self, flight_key: Tuple[asyncio.AbstractEventLoop, Hashable], flight: _Flight, task: "asyncio.Task[Any]") -> None:
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]
+        # 所有调用方都已取消时, 避免报告未获取的异常
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取合并统计
+
+        Returns:
+            Dict[str, int]: 包含 executed(实际发起的调用数), shared(合并到已有调用的次数), in_flight
+        """
+        return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._flights)}
+
+
+def coalesced(func: Callable) -> Callable:
+    """
+    合并数据源方法的相同并发调用
+
+    调用按 (方法名, 规范化参数) 在数据源实例上合并, 结果被共享时每个调用方得到独立的深拷贝
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        key = make_call_key(func, args, kwargs)
+        result, shared = await self._get_single_flight().do(key, lambda: func(self, *args, **kwargs))
+        return copy.deepcopy(result) if shared else result
+
+    return wrapper
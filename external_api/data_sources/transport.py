@@ -0,0 +1,312 @@
+"""
+数据源统一HTTP传输层
+
+所有数据源通过 BaseTransport 发起请求, 连接池、压缩与超时语义只在这里调优。
+目前提供两种实现:
+- AiohttpTransport: 基于 aiohttp, 复用 SessionManager 的连接池(默认)
+- HttpxTransport: 基于 httpx, 可通过 HTTP/2 多路复用到 external-api 代理
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlencode
+
+import aiohttp
+
+from .session import SessionManager
+
+logger = logging.getLogger("data_sources_transport")
+
+TRANSPORT_AIOHTTP = "aiohttp"
+TRANSPORT_HTTPX = "httpx"
+# 调用方未指定 timeout 时使用的总超时时间(秒)
+DEFAULT_TIMEOUT = 60
+
+
+class TransportError(Exception):
+    """
+    传输层错误: 连接失败、非 2xx 响应或响应体无法解析
+    超时统一抛出 asyncio.TimeoutError, 不使用该异常
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def _decode_json(body: bytes) -> Any:
+    """解析响应体, 不校验 Content-Type"""
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError as e:
+        raise TransportError(f"Invalid JSON response: {str(e)}")
+
+
+class BaseTransport(ABC):
+    """
+    传输层基类
+    """
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """
+        获取传输层名称
+
+        Returns:
+            str: 传输层名称
+        """
+        pass
+
+    @abstractmethod
+    async def request_json(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Any = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        发送请求并将响应体解析为 JSON
+
+        Args:
+            method: HTTP 方法
+            url: 请求地址
+            headers: 请求头
+            params: 查询参数
+            json: JSON 请求体
+            data: 原始请求体(str/bytes)或表单数据(dict 或键值对列表)
+            timeout: 总超时时间(秒), 为 None 时使用传输层配置的超时时间
+
+        Returns:
+            Any: 解析后的响应体
+
+        Raises:
+            asyncio.TimeoutError: 请求超时
+            TransportError: 连接失败、非 2xx 响应或响应体无法解析
+            TypeError: 传输层不支持的请求体类型
+        """
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        """关闭当前事件循环上的连接"""
+        pass
+
+    @abstractmethod
+    def shutdown(self) -> None:
+        """关闭所有连接, 用于进程退出时的清理"""
+        pass
+
+
+class AiohttpTransport(BaseTransport):
+    """
+    基于 aiohttp 的传输层, 连接池由 SessionManager 管理
+    """
+
+    def __init__(self, session_manager: Optional[SessionManager] = None, timeout: float = DEFAULT_TIMEOUT):
+        self._session_manager = session_manager or SessionManager()
+        self.timeout = timeout
+
+    @property
+    def name(self) -> str:
+        return TRANSPORT_AIOHTTP
+
+    async def request_json(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Any = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        session = self._session_manager.get_session()
+        request_timeout = aiohttp.ClientTimeout(total=self.timeout if timeout is None else timeout)
+        try:
+            async with session.request(
+                method, url, headers=headers, params=params, json=json, data=data, timeout=request_timeout
+            ) as response:
+                body = await response.read()
+                if response.status >= 400:
+                    raise TransportError(f"{response.status}, message='{response.reason}', url='{response.url}'", response.status)
+        except asyncio.TimeoutError:
+            raise
+        except aiohttp.ClientError as e:
+            raise TransportError(str(e)) from e
+        return _decode_json(body)
+
+    async def close(self) -> None:
+        await self._session_manager.close()
+
+    def shutdown(self) -> None:
+        self._session_manager.shutdown()
+
+
+class HttpxTransport(BaseTransport):
+    """
+    基于 httpx 的传输层
+
+    httpx.AsyncClient 同样绑定事件循环, 因此按事件循环各持有一个客户端。
+    安装了 h2 时启用 HTTP/2, 同一代理上的并发请求复用一条连接。
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 32,
+        keepalive_expiry: float = 30,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        import httpx
+
+        self._httpx = httpx
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("h2 is not installed, httpx transport falls back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self._clients: Dict[asyncio.AbstractEventLoop, Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return TRANSPORT_HTTPX
+
+    def _get_client(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                for closed_loop in [item for item in self._clients if item.is_closed()]:
+                    self._clients.pop(closed_loop, None)
+                client = self._httpx.AsyncClient(http2=self.http2, limits=self._limits, trust_env=True)
+                self._clients[loop] = client
+            return client
+
+    async def request_json(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Any = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        content = None
+        form = None
+        if isinstance(data, (str, bytes)):
+            content = data
+        elif isinstance(data, Mapping):
+            form = data
+        elif isinstance(data, (list, tuple)):
+            # httpx 的 data 只接受映射, 键值对列表按 aiohttp 的方式编码为表单, 保留顺序与重复键
+            content = urlencode(data)
+            headers = dict(headers or {})
+            if not any(key.lower() == "content-type" for key in headers):
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+        elif data is not None:
+            raise TypeError(f"Unsupported request body type for httpx transport: {type(data).__name__}")
+        client = self._get_client()
+        try:
+            response = await client.request(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                json=json,
+                content=content,
+                data=form,
+                timeout=self.timeout if timeout is None else timeout,
+            )
+        except self._httpx.TimeoutException as e:
+            raise asyncio.TimeoutError(str(e)) from e
+        except self._httpx.HTTPError as e:
+            raise TransportError(str(e)) from e
+        if response.status_code >= 400:
+            raise TransportError(
+                f"{response.status_code}, message='{response.reason_phrase}', url='{response.url}'", response.status_code
+            )
+        return _decode_json(response.content)
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for loop, client in clients.items():
+            if client.is_closed or loop.is_closed():
+                continue
+            try:
+                if loop.is_running():
+                    asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+                else:
+                    loop.run_until_complete(client.aclose())
+            except Exception as e:
+                logger.warning(f"关闭 httpx 客户端失败: {str(e)}")
+
+
+def create_transport(name: str = TRANSPORT_AIOHTTP, timeout: float = DEFAULT_TIMEOUT) -> BaseTransport:
+    """
+    Create a transport by backend name
+
+    Args:
+        name: str - backend name, aiohttp or httpx
+        timeout: float - total timeout in seconds for requests that do not pass one, default: 60
+
+    Returns:
+        BaseTransport: transport instance
+
+    Raises:
+        ValueError: unknown backend name
+    """
+    if name == TRANSPORT_AIOHTTP:
+        return AiohttpTransport(timeout=timeout)
+    if name == TRANSPORT_HTTPX:
+        return HttpxTransport(timeout=timeout)
+    raise ValueError(f"Unknown transport: {name}")
+
+
+# 未由 ApiClient 绑定传输层的数据源使用的全局默认实例
+_default_transport: Optional[BaseTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_default_transport() -> BaseTransport:
+    """
+    Get the default transport instance
+
+    Returns:
+        BaseTransport: Default transport instance
+    """
+    global _default_transport
+    if _default_transport is None:
+        with _transport_lock:
+            if _default_transport is None:  # Double-check
+                _default_transport = AiohttpTransport()
+                atexit.register(_default_transport.shutdown)
+    return _default_transport
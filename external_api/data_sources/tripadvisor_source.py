@@ -6,12 +6,15 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import httpx
-
 from .base import BaseAPI
+from .cache import cached
+from .singleflight import coalesced
 
 logger = logging.getLogger("tripadvisor_official_source")
 
+# 地点详情变化缓慢, 缓存一天(秒)
+LOCATION_DETAILS_CACHE_TTL = 86400
+
 
 class TripAdvisorSource(BaseAPI):
     """TripAdvisor official API data source"""
@@ -36,10 +39,7 @@ class TripAdvisorSource(BaseAPI):
         if params is None:
             params = {}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        return await self._request_json("GET", url, headers=self.headers, params=params, timeout=self.timeout)
 
     @property
     def source_name(self) -> str:
@@ -177,6 +177,8 @@ class TripAdvisorSource(BaseAPI):
             logger.error(f"Error searching nearby locations: {e}")
             return {"success": False, "error": str(e)}
 
+    @cached(ttl=LOCATION_DETAILS_CACHE_TTL)
+    @coalesced
     async def get_location_details(
         self,
         locationId: int,
@@ -5,15 +5,33 @@ Twitter data source implementation
 import asyncio
 import json
 import logging
+import random
+import re
 from datetime import datetime
-from typing import Any, Dict, Optional
-
-import aiohttp
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
 
 from .base import BaseAPI
+from .cache import TTLCache, cached
+from .dataloader import DataLoader
+from .singleflight import coalesced
+from .transport import TransportError
 
 logger = logging.getLogger("twitter_source")
 
+# 自动翻页时每页请求的默认推文数
+DEFAULT_PAGE_SIZE = 20
+# 用户信息缓存时间(秒)
+USER_INFO_CACHE_TTL = 600
+# 批量获取用户信息时的默认并发数
+DEFAULT_USER_CONCURRENCY = 8
+# 轮询模式: 没有新推文时轮询间隔的放大倍数, 以及间隔的随机抖动比例, 避免大量查询同时轮询
+WATCH_BACKOFF_FACTOR = 2.0
+WATCH_JITTER = 0.1
+# 轮询模式记住的查询数上限及保留时间(秒), 每个查询只记录最新推文 ID 和日期
+WATCH_STATE_SIZE = 4096
+WATCH_STATE_TTL = 86400
+_DATE_PREFIX = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
 
 class TwitterSource(BaseAPI):
     """Twitter data source"""
@@ -29,6 +47,8 @@ class TwitterSource(BaseAPI):
             "X-Biz-Id":"matrix-agent",
             "X-Request-Timeout": str(config["timeout"]-5),
             }
+        # 轮询模式各查询的 (最新推文 ID, 最新推文日期)
+        self._watch_state = TTLCache(maxsize=WATCH_STATE_SIZE, ttl=WATCH_STATE_TTL)
 
     @property
     def source_name(self) -> str:
@@ -41,6 +61,7 @@ class TwitterSource(BaseAPI):
             "description": "Twitter data source, providing tweet search, user info retrieval, and user tweet list retrieval",
         }
 
+    @coalesced
     async def search_tweets(
         self,
         query: str,
@@ -52,6 +73,7 @@ class TwitterSource(BaseAPI):
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         cursor: Optional[str] = None,
+        section: str = "top",
     ) -> Dict[str, Any]:
         """
         Search for tweets.
@@ -66,6 +88,7 @@ class TwitterSource(BaseAPI):
             start_date (Optional[str]): Start date, format: YYYY-MM-DD, default is None
             end_date (Optional[str]): End date, format: YYYY-MM-DD, default is None
             cursor (Optional[str]): Pagination cursor, used to get next page results, default is None for first page
+            section (str): "top" for the most relevant tweets, "latest" for the newest tweets first, default is "top"
 
         Returns:
             Dict[str, Any]: Dictionary containing tweet search results, e.g.
@@ -127,7 +150,7 @@ class TwitterSource(BaseAPI):
             # 构建查询参数
             params = {
                 "query": query,
-                "section": "top",
+                "section": section,
                 "limit": min(limit, 100),  # API限制最大100条
             }
 
@@ -147,12 +170,8 @@ class TwitterSource(BaseAPI):
 
             request_url = f"{self.proxy_url}/search/search"
 
-            # 使用aiohttp发送异步请求
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # 解析响应
-                    data = await response.json(content_type=None)
+            # 发送异步请求
+            data = await self._request_json("GET", request_url, headers=self.headers, params=params, timeout=self._timeout)
 
             # API返回的是JSON字符串，需要先解析
             if isinstance(data, str):
@@ -204,7 +223,7 @@ class TwitterSource(BaseAPI):
             error_msg = f"Request timeout (timeout={self._timeout}s)"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             error_msg = f"HTTP request error: {str(e)}"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
@@ -214,6 +233,8 @@ class TwitterSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    @cached(ttl=USER_INFO_CACHE_TTL)
+    @coalesced
     async def get_user_info(self, username: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Get detailed information about a Twitter user.
@@ -272,12 +293,8 @@ class TwitterSource(BaseAPI):
             if user_id:
                 params["user_id"] = user_id
 
-            # 使用aiohttp发送异步请求
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # 解析响应
-                    data = await response.json(content_type=None)
+            # 发送异步请求
+            data = await self._request_json("GET", request_url, headers=self.headers, params=params, timeout=self._timeout)
 
             # 解析响应数据
             if isinstance(data, str):
@@ -293,7 +310,7 @@ class TwitterSource(BaseAPI):
             error_msg = f"Request timeout (timeout={self._timeout}s)"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             error_msg = f"HTTP request error: {str(e)}"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
@@ -303,8 +320,95 @@ class TwitterSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    async def get_users_info(self, usernames: List[str], max_concurrency: int = DEFAULT_USER_CONCURRENCY) -> Dict[str, Any]:
+        """
+        Get detailed information about several Twitter users, e.g. the distinct authors of search results.
+
+        Duplicate usernames (case-insensitive) are fetched once, lookups run with bounded concurrency, and recently
+        fetched users are served from cache.
+
+        Args:
+            usernames (List[str]): Twitter usernames without @ symbol
+            max_concurrency (int): Maximum number of concurrent lookups, default is 8
+
+        Returns:
+            Dict[str, Any]: Dictionary containing user information keyed by lowercase username, e.g.
+            {
+                "success": True,               # Whether at least one user was retrieved
+                "data": {
+                    "users": {                 # Same format as get_user_info()["data"]
+                        "elonmusk": {"id": "44196397", "username": "elonmusk", ...}
+                    },
+                    "errors": {                # Usernames that could not be retrieved
+                        "unknown_user": "HTTP request error: ..."
+                    }
+                }
+            }
+        """
+
+        # Example:
+        #     >>> from external_api.data_sources.client import get_client
+        #     >>> client = get_client()
+        #     >>> tweets = (await client.twitter.search_tweets("Tesla", limit=50))["data"]["tweets"]
+        #     >>> result = await client.twitter.get_users_info([tweet["author"]["username"] for tweet in tweets])
+        #     >>> for username, user in result["data"]["users"].items():
+        #     ...     print(username, user["public_metrics"]["followers_count"])
+        # """
+        loader = self.user_loader(max_concurrency=max_concurrency)
+        keys = list(dict.fromkeys(username.lower() for username in usernames if username))
+        users: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        for key, result in zip(keys, await loader.load_many(keys)):
+            if result.get("success"):
+                users[key] = result["data"]
+            else:
+                errors[key] = result.get("error", "Unknown error")
+        if keys and not users:
+            return {"success": False, "error": f"Failed to get user info: {next(iter(errors.values()))}"}
+        return {"success": True, "data": {"users": users, "errors": errors}}
+
+    def user_loader(self, max_concurrency: int = DEFAULT_USER_CONCURRENCY) -> DataLoader:
+        """
+        Create a loader that batches user lookups, e.g. one per request that enriches tweets with author details.
+
+        Lookups made through `await loader.load(username)` in the same event loop tick are collected, de-duplicated
+        and fetched together with bounded concurrency. Each result is kept for the lifetime of the loader, in the
+        format returned by get_user_info.
+
+        Args:
+            max_concurrency (int): Maximum number of concurrent lookups, default is 8
+
+        Returns:
+            DataLoader: Loader whose load(username) returns the get_user_info result
+        """
+
+        # Example:
+        #     >>> from external_api.data_sources.client import get_client
+        #     >>> client = get_client()
+        #     >>> loader = client.twitter.user_loader()
+        #     >>> async def enrich(tweet):
+        #     ...     tweet["author_info"] = await loader.load(tweet["author"]["username"])
+        #     >>> await asyncio.gather(*[enrich(tweet) for tweet in tweets])
+        # """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(username: Hashable) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_user_info(str(username))
+
+        async def batch_fn(usernames: List[Hashable]) -> List[Dict[str, Any]]:
+            return list(await asyncio.gather(*[fetch(username) for username in usernames]))
+
+        return DataLoader(batch_fn)
+
     async def get_user_tweets(
-        self, username: str, limit: int = 10, user_id: Optional[str] = None, include_replies: bool = False, include_pinned: bool = False
+        self,
+        username: str,
+        limit: int = 10,
+        user_id: Optional[str] = None,
+        include_replies: bool = False,
+        include_pinned: bool = False,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Get a list of tweets from a Twitter user.
@@ -315,6 +419,7 @@ class TwitterSource(BaseAPI):
             user_id (Optional[str]): Twitter user ID, default is None, if provided user_id, username will be ignored
             include_replies (bool): Whether to include reply tweets, default is False
             include_pinned (bool): Whether to include pinned tweets, default is False
+            cursor (Optional[str]): Pagination cursor, used to get next page results, default is None for first page
 
         Returns:
             Dict[str, Any]: Dictionary containing user tweet list, e.g.
@@ -382,13 +487,11 @@ class TwitterSource(BaseAPI):
 
             if user_id:
                 params["user_id"] = user_id
+            if cursor:
+                params["continuation_token"] = cursor
 
-            # 使用aiohttp发送异步请求
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # 解析响应
-                    data = await response.json(content_type=None)
+            # 发送异步请求
+            data = await self._request_json("GET", request_url, headers=self.headers, params=params, timeout=self._timeout)
 
             # 解析响应数据
             if isinstance(data, str):
@@ -415,7 +518,7 @@ class TwitterSource(BaseAPI):
             error_msg = f"Request timeout (timeout={self._timeout}s)"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             error_msg = f"HTTP request error: {str(e)}"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
@@ -425,6 +528,284 @@ class TwitterSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    async def iter_search_tweets(
+        self,
+        query: str,
+        max_tweets: int = 100,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        lang: Optional[str] = None,
+        min_retweets: Optional[int] = None,
+        min_likes: Optional[int] = None,
+        min_replies: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over tweets matching a search, fetching further pages automatically.
+
+        The next page is requested while the current one is being consumed. Tweets repeated across pages are
+        yielded only once. Iteration stops after max_tweets tweets, when there are no more pages, or when a whole
+        page is older than start_date.
+
+        Args:
+            query (str): Search keyword, e.g. "Tesla" or "#TSLA"
+            max_tweets (int): Maximum number of tweets to yield, default is 100
+            page_size (int): Number of tweets requested per page, at most 100, default is 20
+            lang (Optional[str]): Language code, zh for Chinese, en for English, default is None
+            min_retweets (Optional[int]): Minimum number of retweets, default is None
+            min_likes (Optional[int]): Minimum number of likes, default is None
+            min_replies (Optional[int]): Minimum number of replies, default is None
+            start_date (Optional[str]): Start date, format: YYYY-MM-DD, tweets before it are skipped, default is None
+            end_date (Optional[str]): End date, format: YYYY-MM-DD, tweets after it are skipped, default is None
+
+        Yields:
+            Dict[str, Any]: Tweets in the same format as the items of search_tweets()["data"]["tweets"]
+
+        Raises:
+            RuntimeError: A page could not be fetched, tweets from earlier pages have already been yielded
+        """
+
+        # Example:
+        #     >>> from external_api.data_sources.client import get_client
+        #     >>> client = get_client()
+        #     >>> async for tweet in client.twitter.iter_search_tweets("Tesla", max_tweets=200, start_date="2024-01-01"):
+        #     ...     print(tweet["created_at"], tweet["text"])
+        # """
+
+        def fetch_page(cursor: Optional[str]) -> Awaitable[Dict[str, Any]]:
+            return self.search_tweets(
+                query,
+                limit=page_size,
+                lang=lang,
+                min_retweets=min_retweets,
+                min_likes=min_likes,
+                min_replies=min_replies,
+                start_date=start_date,
+                end_date=end_date,
+                cursor=cursor,
+            )
+
+        async for tweet in self._paginate(fetch_page, max_tweets, start_date, end_date):
+            yield tweet
+
+    async def iter_user_tweets(
+        self,
+        username: str,
+        max_tweets: int = 100,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        user_id: Optional[str] = None,
+        include_replies: bool = False,
+        include_pinned: bool = False,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over the tweets of a Twitter user, fetching further pages automatically.
+
+        The next page is requested while the current one is being consumed. Tweets repeated across pages are
+        yielded only once. Iteration stops after max_tweets tweets, when there are no more pages, or when a whole
+        page is older than start_date.
+
+        Args:
+            username (str): Twitter username without @ symbol
+            max_tweets (int): Maximum number of tweets to yield, default is 100
+            page_size (int): Number of tweets requested per page, at most 100, default is 20
+            user_id (Optional[str]): Twitter user ID, default is None, if provided user_id, username will be ignored
+            include_replies (bool): Whether to include reply tweets, default is False
+            include_pinned (bool): Whether to include pinned tweets, default is False
+            start_date (Optional[str]): Start date, format: YYYY-MM-DD, tweets before it are skipped, default is None
+            end_date (Optional[str]): End date, format: YYYY-MM-DD, tweets after it are skipped, default is None
+
+        Yields:
+            Dict[str, Any]: Tweets in the same format as the items of get_user_tweets()["data"]["tweets"]
+
+        Raises:
+            RuntimeError: A page could not be fetched, tweets from earlier pages have already been yielded
+        """
+
+        # Example:
+        #     >>> from external_api.data_sources.client import get_client
+        #     >>> client = get_client()
+        #     >>> async for tweet in client.twitter.iter_user_tweets("elonmusk", max_tweets=50, start_date="2024-03-01"):
+        #     ...     print(tweet["created_at"], tweet["text"])
+        # """
+
+        def fetch_page(cursor: Optional[str]) -> Awaitable[Dict[str, Any]]:
+            return self.get_user_tweets(
+                username,
+                limit=page_size,
+                user_id=user_id,
+                include_replies=include_replies,
+                include_pinned=include_pinned,
+                cursor=cursor,
+            )
+
+        async for tweet in self._paginate(fetch_page, max_tweets, start_date, end_date):
+            yield tweet
+
+    async def watch_search_tweets(
+        self,
+        query: str,
+        interval: float = 60,
+        max_interval: float = 900,
+        since_id: Optional[str] = None,
+        lang: Optional[str] = None,
+        min_retweets: Optional[int] = None,
+        min_likes: Optional[int] = None,
+        min_replies: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_pages: int = 5,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Watch a search and yield only tweets that are new since the previous poll, for keyword monitoring.
+
+        The newest tweet ID and date are remembered per query, also across watches of the same query, and only
+        tweets with a larger ID are yielded, oldest first. When there is no starting point (no since_id and the query
+        was not watched before), the first poll only records the newest tweet. When a poll finds nothing new, the
+        wait before the next poll doubles up to max_interval; it returns to interval once new tweets arrive.
+        Failed polls are logged and retried with the same backoff. The watch runs until the caller stops iterating.
+
+        Args:
+            query (str): Search keyword, e.g. "Tesla" or "#TSLA"
+            interval (float): Seconds between polls while new tweets keep arriving, default is 60
+            max_interval (float): Maximum seconds between polls when nothing is new, default is 900
+            since_id (Optional[str]): Only yield tweets newer than this tweet ID, default is None
+            lang (Optional[str]): Language code, zh for Chinese, en for English, default is None
+            min_retweets (Optional[int]): Minimum number of retweets, default is None
+            min_likes (Optional[int]): Minimum number of likes, default is None
+            min_replies (Optional[int]): Minimum number of replies, default is None
+            page_size (int): Number of tweets requested per page, at most 100, default is 20
+            max_pages (int): Maximum number of pages fetched in one poll when many tweets are new, default is 5
+
+        Yields:
+            Dict[str, Any]: New tweets in the same format as the items of search_tweets()["data"]["tweets"]
+        """
+
+        # Example:
+        #     >>> from external_api.data_sources.client import get_client
+        #     >>> client = get_client()
+        #     >>> async for tweet in client.twitter.watch_search_tweets("#TSLA", interval=60):
+        #     ...     print(tweet["created_at"], tweet["text"])
+        # """
+        state_key = (query, lang, min_retweets, min_likes, min_replies)
+        state: Optional[Tuple[int, Optional[str]]] = self._watch_state.get(state_key)
+        if since_id is not None:
+            state = (self._tweet_id(since_id), state[1] if state else None)
+        delay = interval
+        while True:
+            newest_id, newest_date = state if state else (0, None)
+            tweets = []
+            cursor: Optional[str] = None
+            failed = False
+            for _ in range(max(1, max_pages)):
+                result = await self.search_tweets(
+                    query,
+                    limit=page_size,
+                    lang=lang,
+                    min_retweets=min_retweets,
+                    min_likes=min_likes,
+                    min_replies=min_replies,
+                    start_date=newest_date,
+                    cursor=cursor,
+                    section="latest",
+                )
+                if not result.get("success"):
+                    logger.warning(f"Polling tweets for {query!r} failed: {result.get('error')}")
+                    failed = True
+                    break
+                page = result["data"]["tweets"]
+                new_tweets = [tweet for tweet in page if self._tweet_id(tweet["id"]) > newest_id]
+                tweets.extend(new_tweets)
+                # 首次轮询只记录起点; 本页出现已见过的推文说明新推文已取完
+                cursor = result["data"].get("cursor")
+                if state is None or len(new_tweets) < len(page) or not page or not cursor:
+                    break
+            else:
+                logger.warning(f"More than {max_pages} pages of new tweets for {query!r}, older new tweets are skipped")
+
+            if tweets:
+                tweets = list({tweet["id"]: tweet for tweet in tweets}.values())
+                tweets.sort(key=lambda tweet: self._tweet_id(tweet["id"]))
+                newest = tweets[-1]
+                state_is_new = state is None
+                state = (self._tweet_id(newest["id"]), self._tweet_date(newest) or newest_date)
+                self._watch_state.set(state_key, state)
+                delay = interval
+                if not state_is_new:
+                    for tweet in tweets:
+                        yield tweet
+            else:
+                if state is None and not failed:
+                    # 当前没有任何推文, 之后出现的推文都是新推文
+                    state = (0, None)
+                delay = min(delay * WATCH_BACKOFF_FACTOR, max_interval)
+            await asyncio.sleep(delay * random.uniform(1 - WATCH_JITTER, 1 + WATCH_JITTER))
+
+    async def _paginate(
+        self,
+        fetch_page: Callable[[Optional[str]], Awaitable[Dict[str, Any]]],
+        max_tweets: int,
+        start_date: Optional[str],
+        end_date: Optional[str],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        逐条产出分页结果中的推文, 产出当前页时已在后台请求下一页
+
+        推文按 ID 去重, 超出日期范围的推文跳过; 达到 max_tweets 条、没有下一页、
+        下一页没有新推文或整页推文都早于 start_date 时停止, 停止时取消尚未完成的预取
+        """
+        seen_ids: Set[str] = set()
+        remaining = max_tweets
+        cursor: Optional[str] = None
+        next_page: Optional["asyncio.Future[Dict[str, Any]]"] = asyncio.ensure_future(fetch_page(None))
+        try:
+            while next_page is not None and remaining > 0:
+                result = await next_page
+                next_page = None
+                if not result.get("success"):
+                    raise RuntimeError(result.get("error", "Unknown error"))
+
+                data = result["data"]
+                new_tweets = [tweet for tweet in data.get("tweets", []) if tweet["id"] not in seen_ids]
+                seen_ids.update(tweet["id"] for tweet in new_tweets)
+                dates = [self._tweet_date(tweet) for tweet in new_tweets]
+                tweets: List[Dict[str, Any]] = [
+                    tweet
+                    for tweet, date in zip(new_tweets, dates)
+                    if date is None or ((not start_date or date >= start_date) and (not end_date or date <= end_date))
+                ]
+                tweets = tweets[:remaining]
+                remaining -= len(tweets)
+
+                # 整页都早于起始日期时不再翻页, 置顶推文等个别旧推文不影响
+                all_before_start = bool(start_date and all(date is not None and date < start_date for date in dates))
+                next_cursor = data.get("cursor")
+                if remaining > 0 and new_tweets and not all_before_start and next_cursor and next_cursor != cursor:
+                    cursor = next_cursor
+                    next_page = asyncio.ensure_future(fetch_page(cursor))
+
+                for tweet in tweets:
+                    yield tweet
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
+    @staticmethod
+    def _tweet_id(tweet_id: Any) -> int:
+        """推文 ID 按时间递增, 转换为整数用于比较新旧, 无法识别时返回 0"""
+        try:
+            return int(tweet_id)
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def _tweet_date(tweet: Dict[str, Any]) -> Optional[str]:
+        """获取推文的发布日期 YYYY-MM-DD, 无法识别时返回 None"""
+        created_at = tweet.get("created_at")
+        if isinstance(created_at, str) and _DATE_PREFIX.match(created_at):
+            return created_at[:10]
+        return None
+
     def _format_date(self, date_str: Optional[str]) -> Optional[str]:
         """Format date string"""
         if not date_str:
@@ -5,14 +5,40 @@ Yahoo Finance data source implementation
 import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-import aiohttp
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Set
 
 from .base import BaseAPI
+from .cache import cached
+from .price_history import (
+    MAX_CHART_RANGE_SECONDS,
+    PRICE_FORMAT_COLUMNS,
+    PRICE_FORMAT_NUMPY,
+    PRICE_FORMATS,
+    PriceHistoryStore,
+    format_dates,
+    split_range,
+    to_columns,
+    to_numpy_columns,
+    to_records,
+)
+from .singleflight import coalesced
+from .transport import TransportError
+
+if TYPE_CHECKING:
+    from .indicators import IndicatorCache
 
 logger = logging.getLogger("yahoo_finance_source")
 
+# 响应缓存过期时间(秒): 行情摘要随盘中交易变化, 基本面数据按季度更新
+STOCK_INFO_CACHE_TTL = 300
+FUNDAMENTALS_CACHE_TTL = 3600
+
+# 批量获取股价时同时进行的请求数上限
+DEFAULT_MAX_CONCURRENCY = 8
+
+# 单只股票长区间分片获取K线时同时进行的请求数上限
+DEFAULT_CHART_CONCURRENCY = 4
+
 
 class YahooFinanceSource(BaseAPI):
     """Yahoo Finance API data source implementation"""
@@ -32,6 +58,12 @@ class YahooFinanceSource(BaseAPI):
             "X-Biz-Id": "matrix-agent",
             "X-Request-Timeout": str(config["timeout"] - 5),
         }
+        # Local price history, get_stock_price only downloads ranges that are not cached yet.
+        # Series are refetched after PriceHistoryStore.max_age so split and dividend adjustments are picked up
+        self._price_history = PriceHistoryStore()
+        # Indicator results computed from the local price history, invalidated when a series is updated.
+        # Created on first use so that importing this source does not import NumPy
+        self._indicator_cache: Optional["IndicatorCache"] = None
 
     @property
     def source_name(self) -> str:
@@ -53,6 +85,7 @@ class YahooFinanceSource(BaseAPI):
             "description": "Yahoo Finance data source, providing stock price and company information query and stock related news query",
         }
 
+    @coalesced
     async def get_stock_price(
         self,
         symbol: str,
@@ -60,6 +93,7 @@ class YahooFinanceSource(BaseAPI):
         end_date: str,
         interval: str = "1d",
         events: str = "",
+        output_format: str = "records",
     ) -> Dict[str, Any]:
         """Get stock price data. Please set start_date, end_date, interval reasonably to avoid getting too much data,
         which could cause request timeout or performance issues.
@@ -70,6 +104,10 @@ class YahooFinanceSource(BaseAPI):
             end_date: End date in YYYY-MM-DD format
             interval: Time interval, options: 1m|2m|5m|15m|30m|60m|1d|1wk|1mo, default: 1d
             events: Event type, options: capitalGain|div|split|earn|history, default: empty
+            output_format: Format of "prices", options: records|columns|numpy, default: records.
+                records is a list of dicts as shown below; columns is a dict of parallel lists
+                {"date": [...], "timestamp": [...], "open": [...], "high": [...], "low": [...], "close": [...], "volume": [...]};
+                numpy has the same keys with NumPy arrays, "date" as datetime64[D]. Use columns or numpy for large intraday ranges.
 
         Returns:
             Dict[str, Any]: Dictionary containing stock price data, e.g.
@@ -106,52 +144,22 @@ class YahooFinanceSource(BaseAPI):
             if start_timestamp > end_timestamp:
                 raise ValueError("start_date cannot be greater than end_date")
 
-            # Build request parameters
-            params = {
-                "symbol": symbol,
-                "period1": start_timestamp,
-                "period2": end_timestamp,
-                "interval": interval,
-                "region": "US",  # Default use US area
-                "includePrePost": "false",
-                "useYfid": "true",
-                "includeAdjustedClose": "true",
-            }
-
-            # If events parameter is provided, add to request
-            if events:
-                params["events"] = events
+            if output_format not in PRICE_FORMATS:
+                raise ValueError(f"output_format must be one of {', '.join(PRICE_FORMATS)}")
 
-            request_url = f"{self.proxy_url}/stock/v3/get-chart"
+            failed = await self._update_price_history(symbol, start_timestamp, end_timestamp, interval, events)
+            if failed:
+                return failed
 
-            # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # Parse the response
-                    data = await response.json()
+            timestamps, bars = self._price_history.get(symbol, interval, start_timestamp, end_timestamp)
 
-            # Check if there is an error in API response
-            if data.get("chart", {}).get("error"):
-                return {"success": False, "error": str(data["chart"]["error"])}
-
-            # Parse response data
-            chart_data = data["chart"]["result"][0]
-            timestamps = chart_data["timestamp"]
-            quote = chart_data["indicators"]["quote"][0]
-
-            # Build price data list
-            prices = []
-            for i, timestamp in enumerate(timestamps):
-                price_data = {
-                    "date": datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d"),
-                    "open": quote["open"][i],
-                    "high": quote["high"][i],
-                    "low": quote["low"][i],
-                    "close": quote["close"][i],
-                    "volume": int(quote["volume"][i]),
-                }
-                prices.append(price_data)
+            # Build price data in the requested format
+            if output_format == PRICE_FORMAT_NUMPY:
+                prices: Any = to_numpy_columns(timestamps, bars)
+            elif output_format == PRICE_FORMAT_COLUMNS:
+                prices = to_columns(timestamps, bars)
+            else:
+                prices = to_records(timestamps, bars)
 
             return {"success": True, "data": {"symbol": symbol, "prices": prices}}
 
@@ -159,7 +167,7 @@ class YahooFinanceSource(BaseAPI):
             error_msg = f"Request timeout (timeout={self._timeout}s)"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
-        except aiohttp.ClientError as e:
+        except TransportError as e:
             error_msg = f"HTTP request error: {str(e)}"
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
@@ -168,6 +176,87 @@ class YahooFinanceSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": f"Unknown error: {str(e)}"}
 
+    async def _update_price_history(
+        self, symbol: str, start_timestamp: int, end_timestamp: int, interval: str, events: str
+    ) -> Optional[Dict[str, Any]]:
+        """Download the parts of [start_timestamp, end_timestamp) that are missing from the local price history
+
+        Returns:
+            Optional[Dict[str, Any]]: None on success, otherwise the first failed chart response
+
+        Raises:
+            Exception: the first error raised by a slice (e.g. asyncio.TimeoutError), after the other slices are stored
+        """
+        # Only request the sub-ranges that are not in the local price history yet,
+        # long intraday ranges are split into slices the upstream API can return in full
+        slices = [
+            piece
+            for gap_start, gap_end in self._price_history.missing_ranges(symbol, interval, start_timestamp, end_timestamp)
+            for piece in split_range(gap_start, gap_end, interval)
+        ]
+        semaphore = asyncio.Semaphore(DEFAULT_CHART_CONCURRENCY)
+
+        async def fetch_slice(slice_start: int, slice_end: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._fetch_chart(symbol, slice_start, slice_end, interval, events)
+
+        # Wait for every slice so that one failing slice neither discards the others nor leaves them running unobserved
+        chunks = await asyncio.gather(*[fetch_slice(slice_start, slice_end) for slice_start, slice_end in slices], return_exceptions=True)
+
+        # Store every successful slice (duplicated boundary bars are merged by timestamp) before reporting a failure,
+        # only the failed ranges stay missing and are requested again next time
+        failed = None
+        error: Optional[BaseException] = None
+        for (slice_start, slice_end), chunk in zip(slices, chunks):
+            if isinstance(chunk, BaseException):
+                error = error or chunk
+            elif not chunk["success"]:
+                failed = failed or chunk
+            else:
+                self._price_history.add(symbol, interval, slice_start, slice_end, chunk["data"]["timestamps"], chunk["data"]["bars"])
+        if error is not None:
+            raise error
+        return failed
+
+    async def _fetch_chart(self, symbol: str, start_timestamp: int, end_timestamp: int, interval: str, events: str) -> Dict[str, Any]:
+        """Fetch chart bars of [start_timestamp, end_timestamp) from the upstream API
+
+        Returns:
+            Dict[str, Any]: {"success": True, "data": {"timestamps": [...], "bars": [(open, high, low, close, volume), ...]}}
+            or {"success": False, "error": "..."} when the API reports an error
+        """
+        # Build request parameters
+        params = {
+            "symbol": symbol,
+            "period1": start_timestamp,
+            "period2": end_timestamp,
+            "interval": interval,
+            "region": "US",  # Default use US area
+            "includePrePost": "false",
+            "useYfid": "true",
+            "includeAdjustedClose": "true",
+        }
+
+        # If events parameter is provided, add to request
+        if events:
+            params["events"] = events
+
+        request_url = f"{self.proxy_url}/stock/v3/get-chart"
+
+        data = await self._request_json("GET", request_url, headers=self.headers, params=params, timeout=self._timeout)
+
+        # Check if there is an error in API response
+        if data.get("chart", {}).get("error"):
+            return {"success": False, "error": str(data["chart"]["error"])}
+
+        # Parse response data, a range without trading sessions has no timestamp field
+        chart_data = data["chart"]["result"][0]
+        timestamps = chart_data.get("timestamp") or []
+        quote = chart_data["indicators"]["quote"][0] if timestamps else {}
+        bars = list(zip(quote.get("open", []), quote.get("high", []), quote.get("low", []), quote.get("close", []), quote.get("volume", [])))
+
+        return {"success": True, "data": {"timestamps": timestamps, "bars": bars}}
+
     async def get_stock_news(self, symbol: str, region: str = "US", snippet_count: int = 10) -> Dict[str, Any]:
         """获取股票相关的新闻数据
         Args:
@@ -204,63 +293,61 @@ class YahooFinanceSource(BaseAPI):
 
             # 发送POST请求
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    # 使用POST请求，并设置空数据体
-                    async with session.post(
-                        request_url,
-                        headers=self.headers,
-                        params=params,
-                        data="",  # load_more 逻辑，先不适配
-                        timeout=self._timeout,
-                    ) as response:
-                        response.raise_for_status()
-                        data = await response.json()
-
-                        # 提取并处理新闻数据 - 根据实际响应格式调整
-                        stream_items = []
-                        # 检查响应结构中的main.stream路径
-                        if data.get("data") and data["data"].get("main") and data["data"]["main"].get("stream"):
-                            stream_items = data["data"]["main"]["stream"]
-
-                        # 转换为简化的新闻对象列表
-                        simple_news = []
-                        for stream_item in stream_items:
-                            content = stream_item.get("content", {})
-                            if not content:
-                                continue
-
-                            # 获取链接
-                            link = ""
-                            click_through_url = content.get("clickThroughUrl", {})
-                            if click_through_url and click_through_url.get("url"):
-                                link = click_through_url["url"]
-
-                            # 获取发布者
-                            publisher = ""
-                            if content.get("provider") and content["provider"].get("displayName"):
-                                publisher = content["provider"]["displayName"]
-
-                            # 创建简化的新闻项
-                            news_item = {
-                                "title": content.get("title", ""),
-                                "publisher": publisher,
-                                "publish_date": content.get("pubDate", ""),
-                                "link": link,
-                                "uuid": content.get("id", ""),
-                                "content_type": content.get("contentType", ""),
-                                "thumbnail": self._extract_thumbnail(content.get("thumbnail", {})),
-                                "tickers": self._extract_tickers(content.get("finance", {})),
-                            }
-                            simple_news.append(news_item)
+                # 使用POST请求，并设置空数据体
+                data = await self._request_json(
+                    "POST",
+                    request_url,
+                    headers=self.headers,
+                    params=params,
+                    data="",  # load_more 逻辑，先不适配
+                    timeout=self._timeout,
+                )
+
+                # 提取并处理新闻数据 - 根据实际响应格式调整
+                stream_items = []
+                # 检查响应结构中的main.stream路径
+                if data.get("data") and data["data"].get("main") and data["data"]["main"].get("stream"):
+                    stream_items = data["data"]["main"]["stream"]
+
+                # 转换为简化的新闻对象列表
+                simple_news = []
+                for stream_item in stream_items:
+                    content = stream_item.get("content", {})
+                    if not content:
+                        continue
+
+                    # 获取链接
+                    link = ""
+                    click_through_url = content.get("clickThroughUrl", {})
+                    if click_through_url and click_through_url.get("url"):
+                        link = click_through_url["url"]
+
+                    # 获取发布者
+                    publisher = ""
+                    if content.get("provider") and content["provider"].get("displayName"):
+                        publisher = content["provider"]["displayName"]
+
+                    # 创建简化的新闻项
+                    news_item = {
+                        "title": content.get("title", ""),
+                        "publisher": publisher,
+                        "publish_date": content.get("pubDate", ""),
+                        "link": link,
+                        "uuid": content.get("id", ""),
+                        "content_type": content.get("contentType", ""),
+                        "thumbnail": self._extract_thumbnail(content.get("thumbnail", {})),
+                        "tickers": self._extract_tickers(content.get("finance", {})),
+                    }
+                    simple_news.append(news_item)
 
-                        # 返回结构化的新闻列表
-                        return {"success": True, "data": {"symbol": symbol, "simple_news": simple_news}}
+                # 返回结构化的新闻列表
+                return {"success": True, "data": {"symbol": symbol, "simple_news": simple_news}}
 
             except asyncio.TimeoutError:
                 error_msg = f"请求超时 (timeout={self._timeout}秒)"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
-            except aiohttp.ClientError as e:
+            except TransportError as e:
                 error_msg = f"HTTP请求错误: {str(e)}"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
@@ -315,6 +402,8 @@ class YahooFinanceSource(BaseAPI):
                     tickers.append(ticker_data["symbol"])
         return tickers
 
+    @cached(ttl=STOCK_INFO_CACHE_TTL)
+    @coalesced
     async def get_stock_info(self, symbol: str) -> Dict[str, Any]:
         """Get basic stock information
 
@@ -356,16 +445,12 @@ class YahooFinanceSource(BaseAPI):
 
             # Send request
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        response.raise_for_status()
-                        data = await response.json()
-
+                data = await self._request_json("GET", request_url, headers=self.headers, params=params, timeout=self._timeout)
             except asyncio.TimeoutError:
                 error_msg = f"Request timeout (timeout={self._timeout}s)"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
-            except aiohttp.ClientError as e:
+            except TransportError as e:
                 error_msg = f"HTTP request error: {str(e)}"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
@@ -416,8 +501,11 @@ class YahooFinanceSource(BaseAPI):
         end_date: str,
         interval: str = "1d",
         events: str = "",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        symbol_timeout: Optional[float] = None,
+        output_format: str = "records",
     ) -> Dict[str, Any]:
-        """Get price data for multiple stocks
+        """Get price data for multiple stocks. Symbols are fetched concurrently and results keep the input order.
 
         Args:
             symbols(List[str]): Stock code list
@@ -425,6 +513,9 @@ class YahooFinanceSource(BaseAPI):
             end_date(str): End date in YYYY-MM-DD format
             interval(str): Time interval, options: 1m|2m|5m|15m|30m|60m|1d|1wk|1mo, default: 1d
             events(str): Event type, options: capitalGain|div|split|earn|history, default: empty
+            max_concurrency(int): Maximum number of symbols fetched at the same time, default: 8
+            symbol_timeout(Optional[float]): Timeout in seconds for each symbol, default: None (use the request timeout)
+            output_format(str): Format of each stock's "prices", options: records|columns|numpy, default: records, see get_stock_price
 
         Returns:
             Dict[str, Any]: Dictionary containing stock price data, e.g.
@@ -468,22 +559,37 @@ class YahooFinanceSource(BaseAPI):
         try:
             stocks_data = []
             failed_symbols = []
-
-            # Iterate over stock code list to get data for each stock
-            for symbol in symbols:
-                try:
-                    result = await self.get_stock_price(
-                        symbol=symbol, start_date=start_date, end_date=end_date, interval=interval, events=events
-                    )
-                    if result["success"]:
-                        stocks_data.append(result["data"])
-                    else:
-                        failed_symbols.append((symbol, result["error"]))
-                        logger.warning(f"Failed to get data for stock {symbol}: {result['error']}")
-                except Exception as e:
-                    failed_symbols.append((symbol, str(e)))
-                    logger.error(f"Error occurred while getting data for stock {symbol}: {str(e)}")
-                    logger.exception(e)
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def fetch(symbol: str) -> Dict[str, Any]:
+                async with semaphore:
+                    try:
+                        return await asyncio.wait_for(
+                            self.get_stock_price(
+                                symbol=symbol,
+                                start_date=start_date,
+                                end_date=end_date,
+                                interval=interval,
+                                events=events,
+                                output_format=output_format,
+                            ),
+                            timeout=symbol_timeout,
+                        )
+                    except asyncio.TimeoutError:
+                        return {"success": False, "error": f"Request timeout (timeout={symbol_timeout}s)"}
+
+            # Fetch all stocks concurrently, gather keeps the input order
+            results = await asyncio.gather(*[fetch(symbol) for symbol in symbols], return_exceptions=True)
+
+            for symbol, result in zip(symbols, results):
+                if isinstance(result, BaseException):
+                    failed_symbols.append((symbol, str(result) or type(result).__name__))
+                    logger.error(f"Error occurred while getting data for stock {symbol}: {str(result)}", exc_info=result)
+                elif result["success"]:
+                    stocks_data.append(result["data"])
+                else:
+                    failed_symbols.append((symbol, result["error"]))
+                    logger.warning(f"Failed to get data for stock {symbol}: {result['error']}")
 
             # If all stocks fail to get data
             if len(failed_symbols) == len(symbols):
@@ -505,6 +611,159 @@ class YahooFinanceSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": str(e)}
 
+    async def get_stock_indicators(
+        self,
+        symbols: List[str],
+        start_date: str,
+        end_date: str,
+        interval: str = "1d",
+        indicators: Optional[List[str]] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        output_format: str = "columns",
+    ) -> Dict[str, Any]:
+        """Get technical indicators (SMA, EMA, RSI, VWAP) for multiple stocks.
+        Indicators of all stocks are computed together and reused until the underlying price data changes.
+
+        Args:
+            symbols(List[str]): Stock code list
+            start_date(str): Start date in YYYY-MM-DD format
+            end_date(str): End date in YYYY-MM-DD format
+            interval(str): Time interval, options: 1m|2m|5m|15m|30m|60m|1d|1wk|1mo, default: 1d
+            indicators(Optional[List[str]]): Indicator list, "sma:<window>", "ema:<span>", "rsi:<period>" or "vwap",
+                default: ["sma:20", "ema:20", "rsi:14", "vwap"]. VWAP restarts every trading day for intraday intervals
+            max_concurrency(int): Maximum number of symbols fetched at the same time, default: 8
+            output_format(str): Format of the arrays, options: columns|numpy, default: columns (lists, None for unavailable values)
+
+        Returns:
+            Dict[str, Any]: Dictionary containing indicator data, e.g.
+            {
+                "success": true,
+                "data": {
+                    "count": 1,
+                    "stocks": [
+                        {
+                            "symbol": "AAPL",
+                            "date": ["2024-01-01", ...],        # Date of each bar
+                            "timestamp": [1704067200, ...],     # Timestamp of each bar
+                            "close": [184.25, ...],             # Closing price of each bar
+                            "indicators": {
+                                "sma:20": [None, ..., 185.3],   # Same length as close, None before enough bars are available
+                                "rsi:14": [None, ..., 61.2]
+                            }
+                        }
+                    ],
+                    "failed_symbols": []
+                }
+            }
+        """
+        try:
+            from .indicators import DEFAULT_INDICATORS, IndicatorCache, compute_indicators, parse_indicator, to_list
+
+            if self._indicator_cache is None:
+                self._indicator_cache = IndicatorCache()
+
+            indicator_names = list(indicators or DEFAULT_INDICATORS)
+            for indicator in indicator_names:
+                parse_indicator(indicator)
+
+            if output_format not in (PRICE_FORMAT_COLUMNS, PRICE_FORMAT_NUMPY):
+                raise ValueError(f"output_format must be one of {PRICE_FORMAT_COLUMNS}, {PRICE_FORMAT_NUMPY}")
+
+            start_timestamp = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp())
+            end_timestamp = int(datetime.strptime(end_date, "%Y-%m-%d").timestamp())
+
+            if start_timestamp > end_timestamp:
+                raise ValueError("start_date cannot be greater than end_date")
+
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def update(symbol: str) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    return await self._update_price_history(symbol, start_timestamp, end_timestamp, interval, "")
+
+            # Bring the local price history of all stocks up to date concurrently
+            updates = await asyncio.gather(*[update(symbol) for symbol in symbols], return_exceptions=True)
+
+            failed_symbols = []
+            prices: Dict[Hashable, Dict[str, Any]] = {}
+            versions: Dict[Hashable, int] = {}
+            for symbol, result in zip(symbols, updates):
+                if isinstance(result, asyncio.TimeoutError):
+                    failed_symbols.append((symbol, f"Request timeout (timeout={self._timeout}s)"))
+                elif isinstance(result, BaseException):
+                    failed_symbols.append((symbol, str(result) or type(result).__name__))
+                    logger.error(f"Error occurred while getting data for stock {symbol}: {str(result)}", exc_info=result)
+                elif result:
+                    failed_symbols.append((symbol, result["error"]))
+                else:
+                    key: Hashable = (symbol.upper(), interval, start_timestamp, end_timestamp)
+                    versions[key] = self._price_history.version(symbol, interval)
+                    prices[key] = to_numpy_columns(*self._price_history.get(symbol, interval, start_timestamp, end_timestamp))
+
+            # Only compute the indicators whose price series changed since they were last computed
+            values: Dict[Hashable, Dict[str, Any]] = {key: {} for key in prices}
+            stale: Dict[Hashable, Set[str]] = {}
+            for key in prices:
+                for indicator in indicator_names:
+                    cached_values = self._indicator_cache.get(key, indicator, versions[key])
+                    if cached_values is None:
+                        stale.setdefault(key, set()).add(indicator)
+                    else:
+                        values[key][indicator] = cached_values
+            if stale:
+                stale_indicators = [indicator for indicator in indicator_names if any(indicator in names for names in stale.values())]
+                computed = compute_indicators(
+                    {key: prices[key] for key in stale}, stale_indicators, session_vwap=interval in MAX_CHART_RANGE_SECONDS
+                )
+                for key, results in computed.items():
+                    for indicator, indicator_values in results.items():
+                        self._indicator_cache.set(key, indicator, versions[key], indicator_values)
+                        values[key].setdefault(indicator, indicator_values)
+
+            stocks_data = []
+            for symbol in symbols:
+                key = (symbol.upper(), interval, start_timestamp, end_timestamp)
+                if key not in prices:
+                    continue
+                columns = prices[key]
+                if output_format == PRICE_FORMAT_NUMPY:
+                    stock = {
+                        "symbol": symbol,
+                        "date": columns["date"],
+                        "timestamp": columns["timestamp"],
+                        "close": columns["close"],
+                        # Cached arrays are shared between calls, callers get their own copy
+                        "indicators": {indicator: values[key][indicator].copy() for indicator in indicator_names},
+                    }
+                else:
+                    stock = {
+                        "symbol": symbol,
+                        "date": format_dates(columns["timestamp"].tolist()),
+                        "timestamp": columns["timestamp"].tolist(),
+                        "close": to_list(columns["close"]),
+                        "indicators": {indicator: to_list(values[key][indicator]) for indicator in indicator_names},
+                    }
+                stocks_data.append(stock)
+
+            # If all stocks fail to get data
+            if symbols and len(failed_symbols) == len(symbols):
+                error_msg = "All stock data retrieval failed:\n" + "\n".join([f"{symbol}: {error}" for symbol, error in failed_symbols])
+                return {"success": False, "error": error_msg}
+
+            return {
+                "success": True,
+                "data": {
+                    "count": len(stocks_data),
+                    "stocks": stocks_data,
+                    "failed_symbols": [{"symbol": symbol, "error": error} for symbol, error in failed_symbols],
+                },
+            }
+
+        except Exception as e:
+            logger.error(f"Error occurred while getting stock indicators: {str(e)}")
+            logger.exception(e)
+            return {"success": False, "error": str(e)}
+
     async def get_stock_insights(self, symbol: str) -> Dict[str, Any]:
         """Get stock insight data, including technical analysis, valuation, and company snapshot
 
@@ -568,16 +827,12 @@ class YahooFinanceSource(BaseAPI):
             params = {"symbol": symbol}
 
             # Send request
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                try:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        # Check response status
-                        response.raise_for_status()
-                        data = await response.json()
-                except asyncio.TimeoutError:
-                    return {"success": False, "error": f"Request timeout (timeout={self._timeout}s)"}
-                except aiohttp.ClientError as e:
-                    return {"success": False, "error": f"HTTP request error: {str(e)}"}
+            try:
+                data = await self._request_json("GET", request_url, headers=self.headers, params=params, timeout=self._timeout)
+            except asyncio.TimeoutError:
+                return {"success": False, "error": f"Request timeout (timeout={self._timeout}s)"}
+            except TransportError as e:
+                return {"success": False, "error": f"HTTP request error: {str(e)}"}
 
             # Check if there is an error in API response
             if data.get("finance", {}).get("error"):
@@ -634,6 +889,8 @@ class YahooFinanceSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": str(e)}
 
+    @cached(ttl=FUNDAMENTALS_CACHE_TTL)
+    @coalesced
     async def get_stock_statistics(self, symbol: str, region: Optional[str] = None, lang: Optional[str] = None) -> Dict[str, Any]:
         """Get stock statistics data, including valuation metrics, financial ratios, and shareholder information
 
@@ -709,16 +966,12 @@ class YahooFinanceSource(BaseAPI):
                 params["lang"] = lang
 
             # Send request
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                try:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        # Check response status
-                        response.raise_for_status()
-                        data = await response.json()
-                except asyncio.TimeoutError:
-                    return {"success": False, "error": f"Request timeout (timeout={self._timeout}s)"}
-                except aiohttp.ClientError as e:
-                    return {"success": False, "error": f"HTTP request error: {str(e)}"}
+            try:
+                data = await self._request_json("GET", request_url, headers=self.headers, params=params, timeout=self._timeout)
+            except asyncio.TimeoutError:
+                return {"success": False, "error": f"Request timeout (timeout={self._timeout}s)"}
+            except TransportError as e:
+                return {"success": False, "error": f"HTTP request error: {str(e)}"}
 
             # Check if there is an error in API response
             if data.get("quoteSummary", {}).get("error"):
@@ -772,6 +1025,8 @@ class YahooFinanceSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": str(e)}
 
+    @cached(ttl=FUNDAMENTALS_CACHE_TTL)
+    @coalesced
     async def get_financial_data(self, symbol: str) -> Dict[str, Any]:
         """Get stock financial data
 
@@ -852,16 +1107,12 @@ class YahooFinanceSource(BaseAPI):
 
             # Send request
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        response.raise_for_status()
-                        data = await response.json()
-
+                data = await self._request_json("GET", request_url, headers=self.headers, params=params, timeout=self._timeout)
             except asyncio.TimeoutError:
                 error_msg = f"Request timeout (timeout={self._timeout}s)"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
-            except aiohttp.ClientError as e:
+            except TransportError as e:
                 error_msg = f"Request failed: {str(e)}"
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
@@ -928,3 +1179,70 @@ class YahooFinanceSource(BaseAPI):
             logger.error(error_msg)
             logger.exception(e)
             return {"success": False, "error": error_msg}
+
+    async def get_stock_snapshot(self, symbol: str, timeout: Optional[float] = None, news_count: int = 10) -> Dict[str, Any]:
+        """Get a combined view of a company: stock info, insights, statistics, financial data and news.
+        All parts are fetched concurrently under one deadline, parts that fail or miss the deadline are reported in failed_sections.
+
+        Args:
+            symbol(str): Stock code
+            timeout(Optional[float]): Deadline in seconds for the whole snapshot, default: None (use the request timeout)
+            news_count(int): Number of news items to return, defaults to 10
+
+        Returns:
+            Dict[str, Any]: Dictionary containing the snapshot, each part has the same "data" as the corresponding method
+            (get_stock_info, get_stock_insights, get_stock_statistics, get_financial_data, get_stock_news), e.g.
+            {
+                "success": true,                  # True if at least one part succeeded
+                "data": {
+                    "symbol": "AAPL",             # Stock code
+                    "info": {...},                # Data of get_stock_info, None if failed
+                    "insights": {...},            # Data of get_stock_insights, None if failed
+                    "statistics": {...},          # Data of get_stock_statistics, None if failed
+                    "financial_data": {...},      # Data of get_financial_data, None if failed
+                    "news": {...},                # Data of get_stock_news, None if failed
+                    "failed_sections": [          # Failed parts
+                        {"section": "insights", "error": "Request timeout (timeout=30s)"}
+                    ]
+                }
+            }
+        """
+        deadline = self._timeout if timeout is None else timeout
+        sections = {
+            "info": self.get_stock_info(symbol),
+            "insights": self.get_stock_insights(symbol),
+            "statistics": self.get_stock_statistics(symbol),
+            "financial_data": self.get_financial_data(symbol),
+            "news": self.get_stock_news(symbol, snippet_count=news_count),
+        }
+        tasks = {name: asyncio.ensure_future(coroutine) for name, coroutine in sections.items()}
+
+        try:
+            # Latency is bounded by the slowest part or the deadline, whichever comes first
+            _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+
+        data: Dict[str, Any] = {"symbol": symbol}
+        failed_sections = []
+        for name, task in tasks.items():
+            data[name] = None
+            if task in pending:
+                failed_sections.append({"section": name, "error": f"Request timeout (timeout={deadline}s)"})
+            elif task.exception() is not None:
+                error = task.exception()
+                logger.error(f"Error occurred while getting {name} of stock {symbol}: {str(error)}", exc_info=error)
+                failed_sections.append({"section": name, "error": str(error)})
+            elif not task.result()["success"]:
+                failed_sections.append({"section": name, "error": task.result()["error"]})
+            else:
+                data[name] = task.result()["data"]
+        data["failed_sections"] = failed_sections
+
+        if len(failed_sections) == len(tasks):
+            error_msg = "All snapshot parts failed:\n" + "\n".join([f"{item['section']}: {item['error']}" for item in failed_sections])
+            return {"success": False, "error": error_msg}
+
+        return {"success": True, "data": data}
@@ -1,18 +1,108 @@
 import asyncio
+import atexit
+import inspect
 import json
 import os
+import pickle
+import threading
 import uuid
-from typing import Any, Dict, List, Optional, cast
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, cast
 
 import aiohttp
 from pydantic import BaseModel
 
+from external_api.data_sources.cache import TTLCache, freeze
+from external_api.data_sources.session import DEFAULT_LIMIT, SessionManager
+
 ENV_AGENT_NAME = "AGENT_NAME"
 ENV_FUNC_SERVER_PORT = "FUNC_SERVER_PORT"
+# 设置后通过该 Unix 域套接字访问函数服务, 不再走本机 TCP 端口
+ENV_FUNC_SERVER_SOCKET = "FUNC_SERVER_SOCKET"
 MCP_FUNCTION_LIST_JSON_FILE = "mcp_function_list.json"
 
 SERVER_PORT = 12306
 PROXY_TIMEOUT = 3600
+# 函数列表条目中 cache_ttl 大于 0 的函数缓存成功结果, cache_size 为缓存条目上限
+FUNCTION_CACHE_SIZE = 128
+
+# 函数服务的连接池, 按 Unix 域套接字路径各持有一个, None 表示 TCP
+_session_managers: Dict[Optional[str], SessionManager] = {}
+_session_managers_lock = threading.Lock()
+
+
+def get_function_session_manager(unix_socket_path: Optional[str] = None) -> SessionManager:
+    """
+    Get the pooled session manager used to call the function server
+
+    Args:
+        unix_socket_path: Unix domain socket of the function server, None for TCP
+
+    Returns:
+        SessionManager: Session manager shared by all FunctionProxy instances
+    """
+    manager = _session_managers.get(unix_socket_path)
+    if manager is None:
+        with _session_managers_lock:
+            manager = _session_managers.get(unix_socket_path)
+            if manager is None:  # Double-check
+                # 所有请求都发往同一个本机函数服务, 单 host 上限与总上限一致
+                manager = SessionManager(limit_per_host=DEFAULT_LIMIT, unix_socket_path=unix_socket_path)
+                atexit.register(manager.shutdown)
+                _session_managers[unix_socket_path] = manager
+    return manager
+
+
+async def close_function_sessions() -> None:
+    """
+    Close the pooled function server connections of the current event loop
+    """
+    for manager in list(_session_managers.values()):
+        await manager.close()
+
+
+# 本进程内实现的函数, 函数名 -> 可调用对象, 注册后对应的 FunctionProxy 不再经由函数服务调用
+_local_functions: Dict[str, Callable[..., Any]] = {}
+
+
+def register_local_function(name: str, func: Optional[Callable[..., Any]] = None) -> Any:
+    """
+    Register an in-process implementation for a function in the function list
+
+    Calls through the FunctionProxy of that name then run the callable directly instead of going through the
+    function server, with the same interception and ToolResult output. The callable receives the call parameters
+    as keyword arguments and may be sync or async; a sync callable runs on the event loop, so keep it short.
+    It may return a ToolResult, a str (used as the message) or any JSON serializable value.
+
+    Can be used as a decorator:
+        @register_local_function("get_time")
+        async def get_time(timezone: str) -> str: ...
+
+    Args:
+        name: function name as in the function list
+        func: callable implementing the function, omit to use as a decorator
+    """
+    if func is None:
+        return lambda f: register_local_function(name, f)
+    _local_functions[name] = func
+    return func
+
+
+def unregister_local_function(name: str) -> None:
+    """
+    Remove an in-process implementation, calls go through the function server again
+    """
+    _local_functions.pop(name, None)
+
+
+def get_local_function(name: str) -> Optional[Callable[..., Any]]:
+    """
+    Get the in-process implementation registered for a function
+
+    Returns:
+        Optional[Callable[..., Any]]: the registered callable, None if the function is served by the function server
+    """
+    return _local_functions.get(name)
 
 
 class ToolResult(BaseModel):
@@ -22,6 +112,33 @@ class ToolResult(BaseModel):
     is_error: bool
 
 
+class ToolEvent(BaseModel):
+    """流式调用中的单个事件"""
+
+    # progress: 进度信息; partial: 部分结果; result: 最终结果, 总是最后一个事件
+    type: str
+    message: str
+    is_error: bool = False
+
+
+TOOL_EVENT_PROGRESS = "progress"
+TOOL_EVENT_PARTIAL = "partial"
+TOOL_EVENT_RESULT = "result"
+
+# 流式调用时两次收到数据之间的最长等待时间(秒)
+STREAM_IDLE_TIMEOUT = 600
+# 通知函数服务取消调用的超时时间(秒)
+CANCEL_TIMEOUT = 5
+# 函数服务返回这些状态码时认为不支持流式接口
+STREAM_UNSUPPORTED_STATUS = (404, 405, 501)
+
+# 不支持流式接口的函数服务地址, 之后直接通过 /execute 调用
+_stream_unsupported: Set[Tuple[Optional[str], str]] = set()
+
+# 后台发送的取消通知, 保留引用直到完成
+_background_tasks: Set["asyncio.Task[None]"] = set()
+
+
 class FunctionProxy:
     def __init__(self, function_info: Dict[str, Any]):
         self.name: str = function_info["name"]
@@ -31,14 +148,25 @@ class FunctionProxy:
         self.params_len = len(self.params)
         self.agent_name: str = os.environ.get(ENV_AGENT_NAME, "")
         self.server_port = SERVER_PORT
+        self.unix_socket_path: Optional[str] = os.environ.get(ENV_FUNC_SERVER_SOCKET) or None
         self.timeout: int = PROXY_TIMEOUT
+        # 幂等函数在函数列表中声明 cache_ttl(秒), 成功结果按规范化参数缓存
+        cache_ttl = float(function_info.get("cache_ttl") or 0)
+        self._result_cache: Optional[TTLCache] = None
+        if cache_ttl > 0:
+            cache_size = int(function_info.get("cache_size") or FUNCTION_CACHE_SIZE)
+            self._result_cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
 
     def get_server_url(self):
+        if self.unix_socket_path:
+            # 经由 Unix 域套接字连接时 host 仅用于 Host 头
+            return "http://localhost"
         if self.server_port == 0:
             raise Exception("PORT is not set, please set it in the environment variable")
         return f"http://localhost:{self.server_port}"
 
-    async def __call__(self, *args, **kwargs) -> ToolResult:
+    def build_request(self, *args, **kwargs) -> Dict[str, Any]:
+        """构建发往函数服务的调用请求, 每次调用生成新的 request_id"""
         call_params = kwargs.copy()
         args_len = len(args)
 
@@ -50,7 +178,7 @@ class FunctionProxy:
                 if i < self.params_len:
                     call_params[self.params[i]["name"]] = args[i]
 
-        request = {
+        return {
             "request_id": str(uuid.uuid4()),
             "function_name": self.origin_name or self.name,
             "function_kind": self.kind,
@@ -58,32 +186,238 @@ class FunctionProxy:
             "parameters": call_params,
         }
 
+    def bind(self, *args, **kwargs) -> "FunctionCall":
+        """
+        绑定调用参数, 返回可交给 execute_batch 批量执行的调用
+        """
+        return FunctionCall(self, self.build_request(*args, **kwargs))
+
+    async def __call__(self, *args, **kwargs) -> ToolResult:
+        request = self.build_request(*args, **kwargs)
+
         # 发出请求前的拦截
         tool_result = self._intercept_request(self.name, request)
         if tool_result is not None:
             return tool_result
 
+        return await self._execute(request)
+
+    def get_cache_stats(self) -> Optional[Dict[str, int]]:
+        """
+        获取结果缓存的命中统计
+
+        Returns:
+            Optional[Dict[str, int]]: 包含 size, maxsize, hits, misses, evictions, 函数未声明 cache_ttl 时返回 None
+        """
+        if self._result_cache is None:
+            return None
+        return self._result_cache.stats()
+
+    def clear_cache(self) -> None:
+        """
+        清空结果缓存
+        """
+        if self._result_cache is not None:
+            self._result_cache.clear()
+
+    def _get_cached_result(self, request: Dict[str, Any]) -> Optional[ToolResult]:
+        """查找缓存的成功结果, 函数不可缓存或未命中时返回 None"""
+        if self._result_cache is None:
+            return None
+        tool_result = self._result_cache.get((self.name, freeze(request["parameters"])))
+        return None if tool_result is None else tool_result.model_copy()
+
+    def _cache_result(self, request: Dict[str, Any], tool_result: ToolResult) -> None:
+        """缓存成功结果, 错误结果不缓存"""
+        if self._result_cache is not None and not tool_result.is_error:
+            self._result_cache.set((self.name, freeze(request["parameters"])), tool_result.model_copy())
+
+    async def _execute(self, request: Dict[str, Any]) -> ToolResult:
+        tool_result = self._get_cached_result(request)
+        if tool_result is not None:
+            return tool_result
+        tool_result = await self._call(request)
+        self._cache_result(request, tool_result)
+        return tool_result
+
+    async def _call(self, request: Dict[str, Any]) -> ToolResult:
+        local_function = get_local_function(self.name)
+        if local_function is not None:
+            return await self._execute_local(local_function, request)
+
         timeout = aiohttp.ClientTimeout(total=self.timeout)
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            try:
-                async with session.post(f"{self.get_server_url()}/execute", json=request) as response:
-                    if response.status != 200:
-                        return ToolResult(is_error=True, message=f"Function call failed: {await response.text()}")
-
-                    result = await response.json()
-                    if result.get("is_error", False):
-                        return ToolResult(is_error=True, message=result.get("message", "Unknown error"))
-
-                    tool_result = ToolResult(is_error=False, message=result.get("message", "succeed"))
-                    return self._intercept_response(self.name, request, tool_result)
-            except asyncio.TimeoutError:
-                error_msg = f"Timeout when calling function {self.name}"
-                return ToolResult(is_error=True, message=error_msg)
-            except Exception as e:
-                import traceback
-
-                error_msg = f"Error: {str(e)}\nTraceback:\n{traceback.format_exc()}"
-                return ToolResult(is_error=True, message=error_msg)
+        # 复用当前事件循环上的共享会话, 连接保持 keep-alive
+        session = get_function_session_manager(self.unix_socket_path).get_session()
+        try:
+            async with session.post(f"{self.get_server_url()}/execute", json=request, timeout=timeout) as response:
+                if response.status != 200:
+                    return ToolResult(is_error=True, message=f"Function call failed: {await response.text()}")
+
+                return self._to_tool_result(request, await response.json())
+        except asyncio.TimeoutError:
+            error_msg = f"Timeout when calling function {self.name}"
+            return ToolResult(is_error=True, message=error_msg)
+        except Exception as e:
+            import traceback
+
+            error_msg = f"Error: {str(e)}\nTraceback:\n{traceback.format_exc()}"
+            return ToolResult(is_error=True, message=error_msg)
+
+    async def _execute_local(self, local_function: Callable[..., Any], request: Dict[str, Any]) -> ToolResult:
+        """在本进程内执行已注册的函数, 参数不经过 JSON 序列化"""
+        try:
+            result = local_function(**request["parameters"])
+            if inspect.isawaitable(result):
+                result = await asyncio.wait_for(result, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            error_msg = f"Timeout when calling function {self.name}"
+            return ToolResult(is_error=True, message=error_msg)
+        except Exception as e:
+            import traceback
+
+            error_msg = f"Error: {str(e)}\nTraceback:\n{traceback.format_exc()}"
+            return ToolResult(is_error=True, message=error_msg)
+
+        if isinstance(result, ToolResult):
+            if result.is_error:
+                return result
+            return self._intercept_response(self.name, request, result)
+        message = result if isinstance(result, str) else json.dumps(result, ensure_ascii=False, default=str)
+        return self._intercept_response(self.name, request, ToolResult(is_error=False, message=message))
+
+    async def stream(self, *args, **kwargs) -> AsyncIterator[ToolEvent]:
+        """
+        Call the function and iterate over its progress and partial results as they arrive
+
+        The function server answers /execute_stream with newline-delimited JSON events
+        {"type": "progress" | "partial" | "result", "message": "...", "is_error": false}. The last event is always
+        a "result" event with the same content __call__ would return. If the caller stops iterating or is cancelled
+        before the result arrives, the call is cancelled on the server. Servers without streaming support are called
+        through /execute and yield only the result event.
+
+        Example:
+            async for event in proxies["long_task"].stream(query="..."):
+                if event.type == "result":
+                    print(event.message)
+        """
+        request = self.build_request(*args, **kwargs)
+
+        # 发出请求前的拦截
+        tool_result = self._intercept_request(self.name, request)
+        if tool_result is not None:
+            yield ToolEvent(type=TOOL_EVENT_RESULT, message=tool_result.message, is_error=tool_result.is_error)
+            return
+
+        # 命中结果缓存或本进程内实现的函数直接返回最终结果
+        tool_result = self._get_cached_result(request)
+        if tool_result is None and get_local_function(self.name) is not None:
+            tool_result = await self._call(request)
+            self._cache_result(request, tool_result)
+        if tool_result is not None:
+            yield ToolEvent(type=TOOL_EVENT_RESULT, message=tool_result.message, is_error=tool_result.is_error)
+            return
+
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=STREAM_IDLE_TIMEOUT)
+        session = get_function_session_manager(self.unix_socket_path).get_session()
+        finished = False
+        try:
+            server = (self.unix_socket_path, self.get_server_url())
+            fallback = server in _stream_unsupported
+            if not fallback:
+                async with session.post(f"{server[1]}/execute_stream", json=request, timeout=timeout) as response:
+                    if response.status in STREAM_UNSUPPORTED_STATUS:
+                        # 先释放流式请求的连接再回退到 /execute, 之后对该函数服务直接回退
+                        _stream_unsupported.add(server)
+                        fallback = True
+                    elif response.status != 200:
+                        finished = True
+                        yield ToolEvent(type=TOOL_EVENT_RESULT, message=f"Function call failed: {await response.text()}", is_error=True)
+                        return
+                    else:
+                        async with aclosing(self._read_stream(request, response)) as events:
+                            async for event in events:
+                                if event.type == TOOL_EVENT_RESULT:
+                                    finished = True
+                                yield event
+                                if finished:
+                                    return
+                        finished = True
+                        yield ToolEvent(
+                            type=TOOL_EVENT_RESULT, message=f"Stream of function {self.name} ended without a result", is_error=True
+                        )
+                        return
+
+            tool_result = await self._call(request)
+            self._cache_result(request, tool_result)
+            finished = True
+            yield ToolEvent(type=TOOL_EVENT_RESULT, message=tool_result.message, is_error=tool_result.is_error)
+        except asyncio.TimeoutError:
+            finished = True
+            yield ToolEvent(type=TOOL_EVENT_RESULT, message=f"Timeout when calling function {self.name}", is_error=True)
+        except (asyncio.CancelledError, GeneratorExit):
+            raise
+        except Exception as e:
+            import traceback
+
+            finished = True
+            error_msg = f"Error: {str(e)}\nTraceback:\n{traceback.format_exc()}"
+            yield ToolEvent(type=TOOL_EVENT_RESULT, message=error_msg, is_error=True)
+        finally:
+            if not finished:
+                # 调用方提前结束或被取消, 在后台通知函数服务停止执行, 不阻塞调用方的取消
+                task = asyncio.ensure_future(self._cancel_remote(request["request_id"]))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+
+    async def _read_stream(self, request: Dict[str, Any], response: aiohttp.ClientResponse) -> AsyncGenerator[ToolEvent, None]:
+        """按行解析流式响应, 单行大小不受 StreamReader.readline 的缓冲上限限制, 未结束的行分段暂存"""
+        pending: List[bytes] = []
+        async for chunk in response.content.iter_any():
+            *lines, rest = chunk.split(b"\n")
+            if lines and pending:
+                lines[0] = b"".join(pending) + lines[0]
+                pending = []
+            if rest:
+                pending.append(rest)
+            for line in lines:
+                event = self._parse_stream_line(request, line)
+                if event is not None:
+                    yield event
+        event = self._parse_stream_line(request, b"".join(pending))
+        if event is not None:
+            yield event
+
+    def _parse_stream_line(self, request: Dict[str, Any], line: bytes) -> Optional[ToolEvent]:
+        """解析一行流式事件, 空行返回 None, 最终结果经过与 __call__ 相同的响应拦截"""
+        line = line.strip()
+        if not line:
+            return None
+        data = json.loads(line)
+        event_type = data.get("type", TOOL_EVENT_RESULT)
+        if event_type == TOOL_EVENT_RESULT:
+            tool_result = self._to_tool_result(request, data)
+            self._cache_result(request, tool_result)
+            return ToolEvent(type=TOOL_EVENT_RESULT, message=tool_result.message, is_error=tool_result.is_error)
+        return ToolEvent(type=event_type, message=data.get("message", ""), is_error=data.get("is_error", False))
+
+    async def _cancel_remote(self, request_id: str) -> None:
+        """通知函数服务取消调用, 失败时忽略"""
+        session = get_function_session_manager(self.unix_socket_path).get_session()
+        try:
+            async with session.post(
+                f"{self.get_server_url()}/cancel", json={"request_id": request_id}, timeout=aiohttp.ClientTimeout(total=CANCEL_TIMEOUT)
+            ):
+                pass
+        except Exception:
+            pass
+
+    def _to_tool_result(self, request: Dict[str, Any], result: Dict[str, Any]) -> ToolResult:
+        """将函数服务返回的单个结果转换为 ToolResult"""
+        if result.get("is_error", False):
+            return ToolResult(is_error=True, message=result.get("message", "Unknown error"))
+
+        tool_result = ToolResult(is_error=False, message=result.get("message", "succeed"))
+        return self._intercept_response(self.name, request, tool_result)
 
     def _intercept_request(self, function_name: str, request: Dict[str, Any]) -> Optional[ToolResult]:
         if self.kind == "agent" and self.agent_name and "planner" not in self.agent_name:
@@ -97,14 +431,216 @@ class FunctionProxy:
         return result
 
 
-def load_function_proxys(file_path: str) -> tuple[List[Dict[str, Any]], Dict[str, FunctionProxy]]:
-    # 加载 function_list.json 并创建 function proxies
-    with open(file_path, "r", encoding="utf-8") as f:
-        function_list = json.load(f)
+class FunctionCall:
+    """绑定了参数的一次函数调用, 由 FunctionProxy.bind 创建"""
+
+    __slots__ = ("proxy", "request")
+
+    def __init__(self, proxy: FunctionProxy, request: Dict[str, Any]):
+        self.proxy = proxy
+        self.request = request
+
+    async def __call__(self) -> ToolResult:
+        tool_result = self.proxy._intercept_request(self.proxy.name, self.request)
+        if tool_result is not None:
+            return tool_result
+        return await self.proxy._execute(self.request)
+
+
+# 不支持批量接口的函数服务地址, 之后直接逐个调用
+_batch_unsupported: Set[Tuple[Optional[str], str]] = set()
+# 函数服务返回这些状态码时认为不支持批量接口
+BATCH_UNSUPPORTED_STATUS = (404, 405, 501)
+
+
+async def execute_batch(calls: Sequence[FunctionCall]) -> List[ToolResult]:
+    """
+    Execute several independent function calls in as few round trips as possible
+
+    Calls to the same function server are packed into one POST to /execute_batch, each keeping its own request_id,
+    and the results are matched back by request_id. If the server does not support batching, the calls are sent
+    concurrently to /execute one by one. Cached results of functions declaring cache_ttl are returned without a request.
+
+    Args:
+        calls: calls created by FunctionProxy.bind, e.g. [proxies["search"].bind("query"), proxies["fetch"].bind(url="...")]
+
+    Returns:
+        List[ToolResult]: results in the same order as calls
+    """
+    results: List[Optional[ToolResult]] = [None] * len(calls)
+    groups: Dict[Tuple[Optional[str], str], List[int]] = {}
+    # 本进程内实现的函数直接执行, 不打包进批量请求
+    local_indexes: List[int] = []
+    for index, call in enumerate(calls):
+        # 发出请求前的拦截
+        tool_result = call.proxy._intercept_request(call.proxy.name, call.request)
+        if tool_result is None:
+            tool_result = call.proxy._get_cached_result(call.request)
+        if tool_result is not None:
+            results[index] = tool_result
+            continue
+        if get_local_function(call.proxy.name) is not None:
+            local_indexes.append(index)
+            continue
+        try:
+            server = (call.proxy.unix_socket_path, call.proxy.get_server_url())
+        except Exception as e:
+            results[index] = ToolResult(is_error=True, message=f"Error: {str(e)}")
+            continue
+        groups.setdefault(server, []).append(index)
+
+    async def run_group(server: Tuple[Optional[str], str], indexes: List[int]) -> None:
+        group_results = None
+        if len(indexes) > 1 and server not in _batch_unsupported:
+            group_results = await _post_batch(server, [calls[index] for index in indexes])
+        if group_results is None:
+            group_results = await asyncio.gather(*[calls[index].proxy._call(calls[index].request) for index in indexes])
+        for index, tool_result in zip(indexes, group_results):
+            calls[index].proxy._cache_result(calls[index].request, tool_result)
+            results[index] = tool_result
+
+    async def run_local(index: int) -> None:
+        tool_result = await calls[index].proxy._call(calls[index].request)
+        calls[index].proxy._cache_result(calls[index].request, tool_result)
+        results[index] = tool_result
+
+    await asyncio.gather(
+        *[run_group(server, indexes) for server, indexes in groups.items()], *[run_local(index) for index in local_indexes]
+    )
+    return cast(List[ToolResult], results)
+
+
+async def _post_batch(server: Tuple[Optional[str], str], calls: List[FunctionCall]) -> Optional[List[ToolResult]]:
+    """
+    发送一次批量请求
+
+    Returns:
+        Optional[List[ToolResult]]: 与 calls 顺序一致的结果, 函数服务不支持批量接口时返回 None
+    """
+    unix_socket_path, server_url = server
+    timeout = aiohttp.ClientTimeout(total=max(call.proxy.timeout for call in calls))
+    session = get_function_session_manager(unix_socket_path).get_session()
+    try:
+        async with session.post(
+            f"{server_url}/execute_batch", json={"requests": [call.request for call in calls]}, timeout=timeout
+        ) as response:
+            if response.status in BATCH_UNSUPPORTED_STATUS:
+                _batch_unsupported.add(server)
+                return None
+            if response.status != 200:
+                message = f"Function call failed: {await response.text()}"
+                return [ToolResult(is_error=True, message=message) for _ in calls]
+
+            body = await response.json()
+    except asyncio.TimeoutError:
+        return [ToolResult(is_error=True, message=f"Timeout when calling function {call.proxy.name}") for call in calls]
+    except Exception as e:
+        import traceback
+
+        error_msg = f"Error: {str(e)}\nTraceback:\n{traceback.format_exc()}"
+        return [ToolResult(is_error=True, message=error_msg) for _ in calls]
+
+    results = body.get("results") if isinstance(body, dict) else None
+    if not isinstance(results, list):
+        message = f"Function call failed: invalid batch response: {str(body)[:200]}"
+        return [ToolResult(is_error=True, message=message) for _ in calls]
+
+    by_request_id = {result.get("request_id"): result for result in results if isinstance(result, dict)}
+    tool_results = []
+    for call in calls:
+        result = by_request_id.get(call.request["request_id"])
+        if result is None:
+            tool_results.append(ToolResult(is_error=True, message=f"No result returned for function {call.proxy.name}"))
+        else:
+            tool_results.append(call.proxy._to_tool_result(call.request, result))
+    return tool_results
+
+
+class FunctionProxies(Mapping[str, FunctionProxy]):
+    """
+    按函数名索引的 FunctionProxy 集合
+
+    只在首次访问某个函数时创建它的 FunctionProxy, 函数列表很大时进程启动不必为所有函数创建代理
+    """
+
+    def __init__(self, function_list: List[Dict[str, Any]]):
+        self._function_infos: Dict[str, Dict[str, Any]] = {
+            function_info["name"]: function_info
+            for function_info in function_list
+            if isinstance(function_info, dict) and "name" in function_info
+        }
+        self._proxies: Dict[str, FunctionProxy] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> FunctionProxy:
+        proxy = self._proxies.get(name)
+        if proxy is None:
+            function_info = self._function_infos[name]
+            with self._lock:
+                proxy = self._proxies.get(name)
+                if proxy is None:  # Double-check
+                    proxy = FunctionProxy(function_info)
+                    self._proxies[name] = proxy
+        return proxy
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._function_infos
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._function_infos)
+
+    def __len__(self) -> int:
+        return len(self._function_infos)
+
+
+def _json_loads(data: bytes) -> Any:
+    """解析 JSON, 安装了 orjson 时使用 orjson"""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def _parsed_cache_path(file_path: str) -> str:
+    """函数列表解析结果的缓存文件, 与 .pyc 一样放在同目录的 __pycache__ 下"""
+    directory, file_name = os.path.split(os.path.abspath(file_path))
+    return os.path.join(directory, "__pycache__", f"{file_name}.pickle")
+
+
+def _read_function_list(file_path: str) -> List[Dict[str, Any]]:
+    """
+    读取函数列表
+
+    解析结果连同文件的修改时间与大小缓存到磁盘, 文件未变化时直接读取缓存, 不再解析 JSON;
+    缓存不可读写时退回直接解析
+    """
+    stat = os.stat(file_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cache_path = _parsed_cache_path(file_path)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_signature, function_list = pickle.load(f)
+        if cached_signature == signature:
+            return function_list
+    except Exception:
+        pass
+
+    with open(file_path, "rb") as f:
+        function_list = _json_loads(f.read())
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((signature, function_list), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return function_list
 
-    proxies = {}
-    for function_info in function_list:
-        if isinstance(function_info, dict) and "name" in function_info:
-            proxies[function_info["name"]] = FunctionProxy(function_info)
 
-    return function_list, proxies
+def load_function_proxys(file_path: str) -> tuple[List[Dict[str, Any]], FunctionProxies]:
+    # 加载 function_list.json, FunctionProxy 在首次访问对应函数时创建
+    function_list = _read_function_list(file_path)
+    return function_list, FunctionProxies(function_list)